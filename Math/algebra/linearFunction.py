@@ -29,6 +29,7 @@ class LinearFunction(Function):
         self.b = float(y_intercept)
         def rule(x): return self.m * x + self.b
         super().__init__(rule=rule)
+        self._op = ('linear', self.m, self.b)
 
     @classmethod
     def from_points(cls, points: list[tuple[float, float]]):
@@ -0,0 +1,164 @@
+"""
+cache.py
+
+Defines EvaluationCache, a persistent on-disk cache of evaluated (x, f(x)) results.
+
+Results are stored in a SQLite database keyed by the Function's structural fingerprint and
+repr(x), so they survive restarts and are shared by every process on the host that opens
+the same file. The database runs in WAL mode with a busy timeout and every write is a
+single IMMEDIATE transaction, so concurrent readers and writers never see partial batches.
+When the cache grows past max_entries the least recently used results are evicted.
+"""
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .fingerprint import fingerprint
+
+_CHUNK = 500
+
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS evaluations (
+    fingerprint TEXT NOT NULL,
+    x TEXT NOT NULL,
+    value BLOB NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (fingerprint, x)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS evaluations_accessed ON evaluations (accessed);
+CREATE TABLE IF NOT EXISTS stats (entries INTEGER NOT NULL);
+INSERT INTO stats (entries) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM stats);
+CREATE TRIGGER IF NOT EXISTS evaluations_insert AFTER INSERT ON evaluations
+    BEGIN UPDATE stats SET entries = entries + 1; END;
+CREATE TRIGGER IF NOT EXISTS evaluations_delete AFTER DELETE ON evaluations
+    BEGIN UPDATE stats SET entries = entries - 1; END;
+COMMIT;
+"""
+
+
+class EvaluationCache:
+    """A size-bounded, process-safe store of function evaluations keyed by fingerprint"""
+
+    def __init__(self, path: str, max_entries: int = 1_000_000, timeout: float = 30.0):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            max_entries (int): Number of results kept before least recently used ones are evicted.
+            timeout (float): Seconds to wait for another process's write lock.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = path
+        self.max_entries = max_entries
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block in one BEGIN IMMEDIATE ... COMMIT, rolling back on error"""
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._connection.close()
+
+    def __enter__(self) -> "EvaluationCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT entries FROM stats").fetchone()[0]
+
+    def get_many(self, func, xs: Iterable) -> Dict[Any, Any]:
+        """
+        Look up cached results of func for every x in xs.
+
+        Args:
+            func (Function): The function whose results to read.
+            xs: An iterable of input values.
+        Returns:
+            Dict mapping each cached x to f(x); inputs without a cached result are absent.
+            Inputs that compare equal but differ in repr (1 and 1.0) share one dict key, so
+            use evaluate_many to keep them apart.
+        """
+        by_repr = {repr(x): x for x in xs}
+        return {by_repr[x_repr]: value for x_repr, value in self._get_by_repr(func, list(by_repr)).items()}
+
+    def _get_by_repr(self, func, reprs: List[str]) -> Dict[str, Any]:
+        """Returns cached results of func keyed by repr(x), refreshing their access time"""
+        key = fingerprint(func)
+        found: Dict[str, Any] = {}
+        now = time.time()
+        with self._transaction():
+            for start in range(0, len(reprs), _CHUNK):
+                chunk = reprs[start:start + _CHUNK]
+                marks = ','.join('?' * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT x, value FROM evaluations WHERE fingerprint = ? AND x IN ({marks})",
+                    [key, *chunk]).fetchall()
+                for x_repr, value in rows:
+                    found[x_repr] = pickle.loads(value)
+                self._connection.executemany(
+                    "UPDATE evaluations SET accessed = ? WHERE fingerprint = ? AND x = ?",
+                    [(now, key, x_repr) for x_repr, _ in rows])
+        return found
+
+    def put_many(self, func, items: Iterable[Tuple[Any, Any]]) -> None:
+        """
+        Store (x, f(x)) results of func, then evict least recently used results over the limit.
+
+        Args:
+            func (Function): The function the results belong to.
+            items: An iterable of (x, f(x)) pairs.
+        """
+        key = fingerprint(func)
+        now = time.time()
+        rows = [(key, repr(x), pickle.dumps(y), now) for x, y in items]
+        with self._transaction():
+            self._connection.executemany(
+                "INSERT INTO evaluations (fingerprint, x, value, accessed) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (fingerprint, x) DO UPDATE SET value = excluded.value, accessed = excluded.accessed",
+                rows)
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                self._connection.execute(
+                    "DELETE FROM evaluations WHERE (fingerprint, x) IN "
+                    "(SELECT fingerprint, x FROM evaluations ORDER BY accessed LIMIT ?)", (excess,))
+
+    def evaluate_many(self, func, xs: Iterable) -> List[Any]:
+        """
+        Evaluate func at every x, reading cached results and computing and storing only misses.
+
+        Args:
+            func (Function): The function to evaluate.
+            xs: An iterable of input values.
+        Returns:
+            List of outputs in the same order as xs.
+        """
+        xs = list(xs)
+        # Keyed by repr(x) as in the database, so equal inputs such as 1 and 1.0 stay distinct
+        reprs = [repr(x) for x in xs]
+        by_repr = dict(zip(reprs, xs))
+        found = self._get_by_repr(func, list(by_repr))
+        missing = [x_repr for x_repr in by_repr if x_repr not in found]
+        if missing:
+            computed = func.evaluate_many([by_repr[x_repr] for x_repr in missing])
+            self.put_many(func, [(by_repr[x_repr], y) for x_repr, y in zip(missing, computed)])
+            found.update(zip(missing, computed))
+        return [found[x_repr] for x_repr in reprs]
+
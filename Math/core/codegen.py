@@ -0,0 +1,140 @@
+"""
+codegen.py
+
+Compiles the operator graph behind a Function into a single flat Python function.
+
+Every Function built by compose, the arithmetic operators or a transform records the
+operation that produced it. Walking that graph emits one assignment per distinct
+subexpression (so shared subgraphs are evaluated once), inlines numeric constants and
+LinearFunction coefficients, and turns only the opaque leaf rules into calls. Scalar and
+batched variants are emitted together, and the compiled code is cached by source text so
+structurally identical pipelines reuse it regardless of which leaf rules they bind.
+"""
+import math
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+_BINARY = {'add': '+', 'sub': '-', 'mul': '*', 'truediv': '/'}
+_OUTER = {'vertical_shift': '+', 'vertical_stretch': '*'}
+_INNER = {'horizontal_shift': '-', 'horizontal_stretch': '*'}
+_COMPILABLE = {'identity', 'constant', 'linear', 'compose', 'reflect_over_x_axis', 'reflect_over_y_axis',
+               *_BINARY, *_OUTER, *_INNER}
+
+
+class _Emitter:
+    """Walks a Function graph and emits straight-line assignments"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.params: List[Any] = []
+        self._param_names: Dict[int, str] = {}
+        self._keys: Dict[int, Tuple] = {}
+        self._memo: Dict[Tuple[Tuple, str], str] = {}
+
+    def constant(self, value: Any) -> str:
+        """Inline finite ints and floats; bind anything else as a parameter"""
+        if type(value) in (int, float) and math.isfinite(value):
+            return repr(value)
+        return self.param(value)
+
+    def param(self, value: Any) -> str:
+        name = self._param_names.get(id(value))
+        if name is None:
+            name = f"_p{len(self.params)}"
+            self._param_names[id(value)] = name
+            self.params.append(value)
+        return name
+
+    def assign(self, expression: str) -> str:
+        name = f"_t{len(self.lines)}"
+        self.lines.append(f"{name} = {expression}")
+        return name
+
+    def key(self, func) -> Tuple:
+        """Structural key of func: equal for graphs that would emit identical code"""
+        if id(func) not in self._keys:
+            op = func._op
+            if op is None or op[0] not in _COMPILABLE:
+                key: Tuple = ('call', self.param(func.rule or func))
+            else:
+                key = tuple(self.key(item) if hasattr(item, '_op') else self.constant(item) for item in op[1:])
+                key = (op[0],) + key
+            self._keys[id(func)] = key
+        return self._keys[id(func)]
+
+    def emit(self, func, arg: str) -> str:
+        """Return the name holding func(arg), emitting it once per distinct (subgraph, argument)"""
+        key = (self.key(func), arg)
+        if key not in self._memo:
+            self._memo[key] = self._emit(func, arg)
+        return self._memo[key]
+
+    def _emit(self, func, arg: str) -> str:
+        op = func._op
+        if op is None or op[0] not in _COMPILABLE:
+            return self.assign(f"{self.param(func.rule or func)}({arg})")
+        name, *operands = op
+        if name == 'identity':
+            return arg
+        if name == 'constant':
+            return self.constant(operands[0])
+        if name == 'linear':
+            m, b = operands
+            return self.assign(f"{self.constant(m)} * {arg} + {self.constant(b)}")
+        if name in _BINARY:
+            left, right = (self.emit(f, arg) for f in operands)
+            return self.assign(f"{left} {_BINARY[name]} {right}")
+        if name == 'compose':
+            outer, inner = operands
+            return self.emit(outer, self.emit(inner, arg))
+        inner_func, *value = operands
+        if name in _OUTER:
+            return self.assign(f"{self.emit(inner_func, arg)} {_OUTER[name]} {self.constant(value[0])}")
+        if name in _INNER:
+            return self.emit(inner_func, self.assign(f"{arg} {_INNER[name]} {self.constant(value[0])}"))
+        if name == 'reflect_over_x_axis':
+            return self.assign(f"-{self.emit(inner_func, arg)}")
+        if name == 'reflect_over_y_axis':
+            return self.emit(inner_func, self.assign(f"-{arg}"))
+
+
+def generate_source(func) -> Tuple[str, List[Any]]:
+    """Generate the source of a factory building the scalar and batched variants of func.
+
+    Returns:
+        (source, params) where params are the leaf rules and constants the factory binds."""
+    emitter = _Emitter()
+    result = emitter.emit(func, 'x')
+    signature = ', '.join(f"_p{i}" for i in range(len(emitter.params)))
+    body = emitter.lines or ['pass']
+    scalar = '\n'.join(f"        {line}" for line in body)
+    batched = '\n'.join(f"            {line}" for line in body)
+    source = (f"def _factory({signature}):\n"
+              f"    def scalar(x):\n{scalar}\n"
+              f"        return {result}\n"
+              f"    def batch(xs):\n"
+              f"        out = []\n"
+              f"        append = out.append\n"
+              f"        for x in xs:\n{batched}\n"
+              f"            append({result})\n"
+              f"        return out\n"
+              f"    return scalar, batch\n")
+    return source, emitter.params
+
+
+@lru_cache(maxsize=256)
+def _factory_for(source: str) -> Callable:
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, '<Function.compile>', 'exec'), namespace)
+    return namespace['_factory']
+
+
+def compile_function(func) -> Tuple[Callable, Callable]:
+    """Compile func's operator graph into flat (scalar, batch) callables.
+
+    Args:
+        func (Function): The function to compile.
+    Returns:
+        (scalar, batch) where scalar(x) == func(x) and batch(xs) == [func(x) for x in xs]."""
+    source, params = generate_source(func)
+    return _factory_for(source)(*params)
@@ -0,0 +1,131 @@
+"""
+dual.py
+
+Defines the Dual number class used for forward-mode automatic differentiation.
+
+A dual number a + b·ε (with ε² = 0) carries a value and its derivative together. Feeding
+Dual(x, 1) through any rule built from arithmetic, powers and the elementary functions below
+yields f(x) as the value and f'(x) as the derivative in a single pass, exact to rounding.
+"""
+import math
+from typing import Any, Callable, Tuple
+
+
+class Dual:
+    """A value paired with its derivative: value + deriv·ε"""
+    __slots__ = ('value', 'deriv')
+
+    def __init__(self, value: Any, deriv: Any = 0.0):
+        self.value = value
+        self.deriv = deriv
+
+    def __repr__(self) -> str:
+        return f"Dual({self.value!r}, {self.deriv!r})"
+
+    @staticmethod
+    def _split(other: Any) -> Tuple[Any, Any]:
+        if isinstance(other, Dual):
+            return other.value, other.deriv
+        return other, 0.0
+
+    def __add__(self, other: Any) -> "Dual":
+        value, deriv = self._split(other)
+        return Dual(self.value + value, self.deriv + deriv)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Any) -> "Dual":
+        value, deriv = self._split(other)
+        return Dual(self.value - value, self.deriv - deriv)
+
+    def __rsub__(self, other: Any) -> "Dual":
+        return Dual(other - self.value, -self.deriv)
+
+    def __mul__(self, other: Any) -> "Dual":
+        value, deriv = self._split(other)
+        return Dual(self.value * value, self.deriv * value + self.value * deriv)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Any) -> "Dual":
+        value, deriv = self._split(other)
+        return Dual(self.value / value, (self.deriv * value - self.value * deriv) / (value * value))
+
+    def __rtruediv__(self, other: Any) -> "Dual":
+        return Dual(other / self.value, -other * self.deriv / (self.value * self.value))
+
+    def __pow__(self, other: Any) -> "Dual":
+        if isinstance(other, Dual):
+            result = self.value ** other.value
+            return Dual(result, result * (other.deriv * math.log(self.value)
+                                          + other.value * self.deriv / self.value))
+        if other == 0:
+            return Dual(self.value ** 0, 0.0)
+        return Dual(self.value ** other, other * self.value ** (other - 1) * self.deriv)
+
+    def __rpow__(self, other: Any) -> "Dual":
+        result = other ** self.value
+        return Dual(result, result * math.log(other) * self.deriv)
+
+    def __neg__(self) -> "Dual":
+        return Dual(-self.value, -self.deriv)
+
+    def __pos__(self) -> "Dual":
+        return self
+
+    def __abs__(self) -> "Dual":
+        return self if self.value >= 0 else -self
+
+    def __eq__(self, other: Any) -> bool:
+        return self.value == self._split(other)[0]
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __lt__(self, other: Any) -> bool:
+        return self.value < self._split(other)[0]
+
+    def __le__(self, other: Any) -> bool:
+        return self.value <= self._split(other)[0]
+
+    def __gt__(self, other: Any) -> bool:
+        return self.value > self._split(other)[0]
+
+    def __ge__(self, other: Any) -> bool:
+        return self.value >= self._split(other)[0]
+
+
+def value_and_derivative(func: Callable, x: Any, strict: bool = False) -> Tuple[Any, Any]:
+    """Evaluate func and its derivative at x in one forward pass.
+
+    Args:
+        func (callable): A rule built from operations that accept Dual numbers.
+        x: The input value.
+        strict (bool): Raise TypeError when the result is not a Dual instead of reporting a
+            flat slope, since a rule that drops the Dual (a table lookup, say) may still vary.
+    Returns:
+        (f(x), f'(x)); unless strict, the derivative of a result that does not depend on x is 0."""
+    result = func(Dual(x, 1.0))
+    if isinstance(result, Dual):
+        return result.value, result.deriv
+    if strict:
+        raise TypeError(f"Rule returned {type(result).__name__}, not a Dual, so its derivative is unknown")
+    return result, 0.0
+
+
+def _elementary(func: Callable, deriv: Callable) -> Callable:
+    def apply(x: Any) -> Any:
+        if isinstance(x, Dual):
+            return Dual(func(x.value), deriv(x.value) * x.deriv)
+        return func(x)
+    apply.__name__ = func.__name__
+    apply.__doc__ = f"{func.__name__} that also accepts Dual numbers"
+    return apply
+
+
+sin = _elementary(math.sin, math.cos)
+cos = _elementary(math.cos, lambda v: -math.sin(v))
+tan = _elementary(math.tan, lambda v: 1 / math.cos(v) ** 2)
+exp = _elementary(math.exp, math.exp)
+log = _elementary(math.log, lambda v: 1 / v)
+sqrt = _elementary(math.sqrt, lambda v: 0.5 / math.sqrt(v))
@@ -0,0 +1,89 @@
+"""
+fingerprint.py
+
+Stable structural fingerprints for Functions.
+
+A fingerprint is a SHA-256 digest that depends only on what a Function computes, not on
+object identity, so it is the same in every process running the same source. It is built
+from the recorded operator graph (operation names and constants), LinearFunction
+coefficients, the pairs of table-backed functions, and for opaque rules their bytecode,
+constants and captured variables.
+"""
+import hashlib
+import types
+from collections.abc import Set as AbstractSet
+from typing import Any, List
+
+
+def _describe_value(value: Any, seen: set) -> str:
+    """A deterministic description of a constant or captured variable"""
+    if hasattr(value, '_op') and hasattr(value, 'pairs'):
+        return f"function:{fingerprint(value)}"
+    if isinstance(value, types.CodeType):
+        return _describe_code(value, seen)
+    if isinstance(value, (types.FunctionType, types.MethodType, types.BuiltinFunctionType, type)):
+        return _describe_rule(value, seen)
+    if isinstance(value, (tuple, list, AbstractSet)):
+        items = [_describe_value(item, seen) for item in value]
+        if isinstance(value, AbstractSet):
+            items.sort()
+        return f"{type(value).__name__}({','.join(items)})"
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    text = repr(value)
+    if ' at 0x' in text:
+        raise ValueError(f"Cannot fingerprint {type(value).__name__} value {text}")
+    return text
+
+
+def _describe_code(code: types.CodeType, seen: set) -> str:
+    consts = ','.join(_describe_value(const, seen) for const in code.co_consts)
+    return f"code({code.co_code.hex()};{consts};{','.join(code.co_names)})"
+
+
+def _describe_rule(rule: Any, seen: set) -> str:
+    """Describe a rule by its code and captured values, or by name for builtins"""
+    if id(rule) in seen:
+        return 'recursive'
+    seen.add(id(rule))
+    if isinstance(rule, types.MethodType):
+        return f"method({_describe_rule(rule.__func__, seen)};{_describe_value(rule.__self__, seen)})"
+    if not isinstance(rule, types.FunctionType):
+        module = getattr(rule, '__module__', None) or ''
+        qualname = getattr(rule, '__qualname__', None)
+        if qualname is None:
+            raise ValueError(f"Cannot fingerprint rule {rule!r}")
+        return f"builtin:{module}.{qualname}"
+    cells = [_describe_value(cell.cell_contents, seen) for cell in rule.__closure__ or ()]
+    defaults = [_describe_value(default, seen) for default in rule.__defaults__ or ()]
+    global_values = [f"{name}={_describe_value(rule.__globals__[name], seen)}"
+                     for name in rule.__code__.co_names
+                     if name in rule.__globals__ and not isinstance(rule.__globals__[name], types.ModuleType)]
+    return (f"rule({_describe_code(rule.__code__, seen)};{','.join(cells)};"
+            f"{','.join(defaults)};{','.join(global_values)})")
+
+
+def fingerprint(func) -> str:
+    """Return the stable structural fingerprint of func, cached on the instance.
+
+    Args:
+        func (Function): The function to fingerprint.
+    Returns:
+        str: A hex SHA-256 digest.
+    Raises:
+        ValueError: If a rule captures a value with no stable description."""
+    cached = getattr(func, '_fingerprint', None)
+    if cached is not None:
+        return cached
+    parts: List[str] = []
+    if func._op is not None:
+        name, *operands = func._op
+        parts.append(f"op:{name}")
+        parts.extend(_describe_value(operand, set()) for operand in operands)
+    elif func.rule is not None:
+        parts.append(_describe_rule(func.rule, set()))
+    else:
+        parts.append('pairs:' + ';'.join(sorted(repr(pair) for pair in func.pairs)))
+    digest = hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+    func._fingerprint = digest
+    return digest
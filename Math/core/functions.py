@@ -12,6 +12,12 @@ Intended for use in symbolic mathematics, algebraic manipulation, and educationa
 """
 from typing import Optional, Callable, Any, List, Tuple
 from .relation import Relation
+from .persistent import PersistentSet
+from .sampling import adaptive_analysis, IntervalAnalysis
+from .dual import Dual, value_and_derivative
+from .codegen import compile_function
+from .fingerprint import fingerprint
+from .interpolation import Interpolator
 
 
 class Function(Relation):
@@ -28,13 +34,73 @@ class Function(Relation):
         super().__init__(pairs)
         if not self.is_function:
             raise ValueError("Relation is not a function")
+        self._setup(rule)
 
+    def _setup(self, rule: Optional[Callable]) -> None:
+        """Initialize the rule and every cached analysis"""
         self.rule = rule
         self._symmetry_type = None
         self._intervals_of_increase = None
         self._intervals_of_decrease = None
         self._intervals_of_constant = None
         self._monotonicity = None
+        self._op: Optional[Tuple] = None
+        self._batch_rule: Optional[Callable] = None
+        self._compiled: Optional["Function"] = None
+        self._fingerprint: Optional[str] = None
+
+    @classmethod
+    def _trusted(cls, pairs: PersistentSet, rule: Optional[Callable]) -> "Function":
+        """Build a Function over pairs already known to pass the vertical line test, skipping the O(n) check"""
+        function = cls.__new__(cls)
+        Relation.__init__(function, pairs)
+        function._setup(rule)
+        return function
+
+    def _derive(self, pairs, rule: Callable, *op) -> "Function":
+        """Build a new Function and record the operation that produced it for compile().
+
+        Transforms pass this function's own pairs, which are shared as-is together with the
+        x index instead of being validated again."""
+        if pairs is self._pairs:
+            derived = Function._trusted(pairs, rule)
+            derived._x_index = self._x_index
+        else:
+            derived = Function(pairs=pairs, rule=rule)
+        derived._op = op
+        return derived
+
+    def _admit(self, pairs) -> List[Tuple[Any, Any]]:
+        """Check only the new pairs against the x index, so adding stays O(k) for k new pairs"""
+        by_x = self._index_by_x()
+        admitted = {}
+        for x, y in pairs:
+            known = by_x.get(x)
+            if known is not None:
+                if y not in known:
+                    raise ValueError(f"Relation is not a function: x = {x!r} already has a different value")
+            elif admitted.setdefault(x, y) != y:
+                raise ValueError(f"Relation is not a function: x = {x!r} already has a different value")
+        return list(admitted.items())
+
+    def _share(self, pairs: PersistentSet) -> "Function":
+        """Returns a Function over pairs with this function's rule; adding or removing samples keeps the rule"""
+        if pairs is self._pairs:
+            return self
+        shared = Function._trusted(pairs, self.rule)
+        shared._op = self._op
+        shared._batch_rule = self._batch_rule
+        return shared
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.rule is other.rule and self.pairs == other.pairs
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((type(self).__name__, self.pairs, self.rule))
+        return self._hash
 
     def __call__(self, x: Any):
         """
@@ -47,8 +113,86 @@ class Function(Relation):
         """
         if self.rule:
             return self.rule(x)
+        if isinstance(x, Dual):
+            raise ValueError("A function defined only by pairs cannot be differentiated")
         return self.get_value_for(x)
 
+    def derivative(self) -> "Function":
+        """
+        Return the derivative $f'(x)$ computed by forward-mode automatic differentiation.
+
+        Each point costs one pass through the rule with a Dual number, which propagates through
+        the arithmetic operators, compose and every shift/stretch/reflect transform. Rules that
+        call math functions must use the Dual-aware versions in Math.core.dual.
+
+        Returns:
+            Function: The exact derivative, as a rule-only function. Evaluating it raises
+            TypeError where the rule returns a plain value instead of a Dual (a table lookup,
+            say), since the slope there is unknown rather than 0.
+        """
+        if self.rule is None:
+            raise ValueError("A function defined only by pairs cannot be differentiated")
+        if self._op is not None and self._op[0] == 'constant':
+            return Function.constant(0.0)
+        return Function(rule=lambda x: value_and_derivative(self, x, strict=True)[1])
+
+    def evaluate_many(self, xs) -> List[Any]:
+        """
+        Evaluate the function at every input of xs in one batch.
+
+        Args:
+            xs: An iterable of input values.
+        Returns:
+            List of outputs in the same order as xs.
+        """
+        if self._batch_rule is not None:
+            return self._batch_rule(xs)
+        return [self(x) for x in xs]
+
+    def interpolate(self, mode: str = 'linear', tol: float = 1e-9) -> "Function":
+        """
+        Return a Function that answers f(x) between the sample points of this function's pairs.
+
+        The pairs are sorted and each segment's coefficients precomputed once, so every query
+        costs one bisect. Queries within tol of a sample x return that sample's y exactly.
+
+        Args:
+            mode (str): 'nearest', 'linear', 'monotone' (monotone cubic) or 'spline' (natural cubic).
+            tol (float): Tolerance for matching approximate float keys to sample x values.
+        Returns:
+            Function: The interpolating function, sharing this function's pairs.
+        """
+        interpolator = Interpolator(self.pairs, mode, tol)
+        interpolated = self._derive(self.pairs, interpolator, 'interpolate', self.pairs, mode, tol)
+        interpolated._batch_rule = interpolator.many
+        return interpolated
+
+    def compile(self) -> "Function":
+        """
+        Compile the operator graph behind this function into one flat Python function.
+
+        Every compose, arithmetic operator and transform is inlined into straight-line code,
+        shared subexpressions are evaluated once and numeric constants are written into the
+        source, so only the leaf rules are still called. The batched variant is used by
+        evaluate_many. Generated code is cached by graph structure and shared across pipelines.
+
+        Returns:
+            Function: An equivalent function with the same pairs and a compiled rule.
+        """
+        if self._compiled is None:
+            scalar, batch = compile_function(self)
+            compiled = Function._trusted(self.pairs, scalar)
+            compiled._op = self._op
+            compiled._batch_rule = batch
+            compiled._compiled = compiled
+            self._compiled = compiled
+        return self._compiled
+
+    @property
+    def fingerprint(self) -> str:
+        """Returns a stable structural hash of what this function computes, equal across processes"""
+        return fingerprint(self)
+
     @property
     def return_symmetry_type(self):
         """Returns attribute of symmetry type from object"""
@@ -65,7 +209,9 @@ class Function(Relation):
         Returns:
             Function: The identity function.
         """
-        return Function(pairs=([(x, x) for x in range(range_start, range_end)]), rule=lambda x: x)
+        identity = Function(pairs=([(x, x) for x in range(range_start, range_end)]), rule=lambda x: x)
+        identity._op = ('identity',)
+        return identity
 
     @staticmethod
     def constant(c=0, range_start=0, range_end=1):
@@ -79,7 +225,9 @@ class Function(Relation):
         Returns:
             Function: The constant function.
         """
-        return Function(pairs=([(x, c) for x in range(range_start, range_end)]), rule=lambda x: c)
+        constant = Function(pairs=([(x, c) for x in range(range_start, range_end)]), rule=lambda x: c)
+        constant._op = ('constant', c)
+        return constant
 
     def compose(self, other):
         """Return the composition of this function with another function.
@@ -87,28 +235,30 @@ class Function(Relation):
         Args:
             other (Function): The inner function to compose with.
         Returns:
-            Function: The composed function f(g(x))."""
-        return Function(pairs=self.pairs, rule=lambda x: self(other(x)))
+            Function: The composed function f(g(x)). Its pairs are the hash join
+            of both functions' pairs, so only inputs of g whose output lies in
+            the domain of f are kept."""
+        return self._derive(super().compose(other).pairs, lambda x: self(other(x)), 'compose', self, other)
 
     def __add__(self, other):
         if not isinstance(other, Function):
             return NotImplemented
-        return Function(rule=lambda x: self(x) + other(x))
+        return self._derive(None, lambda x: self(x) + other(x), 'add', self, other)
 
     def __sub__(self, other):
         if not isinstance(other, Function):
             return NotImplemented
-        return Function(rule=lambda x: self(x) - other(x))
+        return self._derive(None, lambda x: self(x) - other(x), 'sub', self, other)
 
     def __mul__(self, other):
         if not isinstance(other, Function):
             return NotImplemented
-        return Function(rule=lambda x: self(x) * other(x))
+        return self._derive(None, lambda x: self(x) * other(x), 'mul', self, other)
 
     def __truediv__(self, other):
         if not isinstance(other, Function):
             return NotImplemented
-        return Function(rule=lambda x: self(x) / other(x))
+        return self._derive(None, lambda x: self(x) / other(x), 'truediv', self, other)
 
     def vertical_shift(self, k):
         """
@@ -119,7 +269,7 @@ class Function(Relation):
         Returns:
             Function: The vertically shifted function.
         """
-        return Function(pairs=self.pairs, rule=lambda x: self(x) + k)
+        return self._derive(self.pairs, lambda x: self(x) + k, 'vertical_shift', self, k)
 
     def horizontal_shift(self, h):
         """
@@ -130,7 +280,7 @@ class Function(Relation):
         Returns:
             Function: The horizontally shifted function.
         """
-        return Function(pairs=self.pairs, rule=lambda x: self(x - h))
+        return self._derive(self.pairs, lambda x: self(x - h), 'horizontal_shift', self, h)
 
     def vertical_stretch(self, a):
         """
@@ -141,7 +291,7 @@ class Function(Relation):
         Returns:
             Function: The vertically stretched function.
         """
-        return Function(pairs=self.pairs, rule=lambda x: self(x) * a)
+        return self._derive(self.pairs, lambda x: self(x) * a, 'vertical_stretch', self, a)
 
     def horizontal_stretch(self, b):
         """
@@ -152,7 +302,7 @@ class Function(Relation):
         Returns:
             Function: The horizontally stretched function.
         """
-        return Function(pairs=self.pairs, rule=lambda x: self(x * b))
+        return self._derive(self.pairs, lambda x: self(x * b), 'horizontal_stretch', self, b)
 
     def reflect_over_x_axis(self) -> 'Function':
         """
@@ -161,7 +311,7 @@ class Function(Relation):
         Returns:
             Function: The function reflected over the x-axis ($f(x) \to -f(x)$).
         """
-        return Function(pairs=self.pairs, rule=lambda x: -self(x))
+        return self._derive(self.pairs, lambda x: -self(x), 'reflect_over_x_axis', self)
 
     def reflect_over_y_axis(self) -> "Function":
         """
@@ -170,7 +320,7 @@ class Function(Relation):
         Returns:
             Function: The function reflected over the y-axis ($f(x) \to f(-x)$).
         """
-        return Function(pairs=self.pairs, rule=lambda x: self(-x))
+        return self._derive(self.pairs, lambda x: self(-x), 'reflect_over_y_axis', self)
 
     def check_symmetry(self) -> None:
         """
@@ -191,42 +341,80 @@ class Function(Relation):
         """
         return self._symmetry_type
 
+    def _rule_analysis(self) -> Optional[IntervalAnalysis]:
+        """Analyze the rule over [min x, max x] of the pairs, or None to fall back to comparing pairs.
+
+        The rule is evaluated between the samples, where it may not be defined (a table lookup,
+        1/x across 0), so any error it raises there falls back to the pairs as well."""
+        if self.rule is None or len(self.pairs) < 2:
+            return None
+        try:
+            start, end = min(self.domain), max(self.domain)
+            return self.analyze_interval(start, end)
+        except (TypeError, ValueError, LookupError, ArithmeticError):
+            return None
+
+    def _pair_intervals(self, compare: Callable[[Any, Any], bool]) -> List[Tuple[Any, Any]]:
+        """Returns every (x0, x1) of adjacent sorted pairs whose y values satisfy compare"""
+        points = sorted(self.pairs)
+        return [(x0, x1) for (x0, y0), (x1, y1) in zip(points, points[1:]) if compare(y0, y1)]
+
     def intervals_of_increase(self):
         """
         Return intervals where the function is increasing.
-        """
 
-        x = [pair[0] for pair in sorted(self.pairs)]
-        y = [pair[1] for pair in sorted(self.pairs)]
-        intervals_of_increase = []
-        for (x0, y0), (x1, y1) in zip(zip(x, y), zip(x[1:], y[1:])):
-            if y0 < y1:
-                intervals_of_increase.append((x0, x1))
-        self._intervals_of_increase = intervals_of_increase
-        return sorted(intervals_of_increase)
+        With a rule the sign of f' is analyzed over [min x, max x] of the pairs, so turning
+        points between samples are found; otherwise adjacent sorted pairs are compared.
+        """
+        analysis = self._rule_analysis()
+        if analysis is not None:
+            return sorted(analysis.increasing)
+        self._intervals_of_increase = self._pair_intervals(lambda y0, y1: y0 < y1)
+        return sorted(self._intervals_of_increase)
 
     def intervals_of_decrease(self):
         """
-        Return intervals where the function is decreasing (not implemented).
+        Return intervals where the function is decreasing, by the sign of f' when there is a rule.
         """
-        x = [pair[0] for pair in sorted(self.pairs)]
-        y = [pair[1] for pair in sorted(self.pairs)]
-        intervals_of_decrease = []
-        for (x0, y0), (x1, y1) in zip(zip(x, y), zip(x[1:], y[1:])):
-            if y0 > y1:
-                intervals_of_decrease.append((x0, x1))
-        self._intervals_of_decrease = intervals_of_decrease
-        return sorted(intervals_of_decrease)
+        analysis = self._rule_analysis()
+        if analysis is not None:
+            return sorted(analysis.decreasing)
+        self._intervals_of_decrease = self._pair_intervals(lambda y0, y1: y0 > y1)
+        return sorted(self._intervals_of_decrease)
 
     def intervals_are_constant(self):
-        x = [pair[0] for pair in sorted(self.pairs)]
-        y = [pair[1] for pair in sorted(self.pairs)]
-        intervals_of_constant = []
-        for (x0, y0), (x1, y1) in zip(zip(x, y), zip(x[1:], y[1:])):
-            if y0 == y1:
-                intervals_of_constant.append((x0, x1))
-        self._intervals_of_constant = intervals_of_constant
-        return sorted(intervals_of_constant)
+        """
+        Return intervals where the function is constant, by the sign of f' when there is a rule.
+        """
+        analysis = self._rule_analysis()
+        if analysis is not None:
+            return sorted(analysis.constant)
+        self._intervals_of_constant = self._pair_intervals(lambda y0, y1: y0 == y1)
+        return sorted(self._intervals_of_constant)
+
+    def analyze_interval(self, start: float, end: float, tol: float = 1e-6, samples: int = 65) -> IntervalAnalysis:
+        """
+        Analyze the rule on the continuous interval [start, end] by adaptive sampling.
+
+        Unlike the pair-based methods this also works for rule-only functions. A coarse grid is
+        evaluated in one batch and only segments where the slope changes sign are refined, so
+        extrema are located to within tol using far fewer evaluations than dense sampling.
+        The intervals are also stored as this function's intervals. The sampled symmetry is
+        only returned, so it never overwrites the exact result of check_symmetry().
+
+        Args:
+            start (float): Left end of the interval.
+            end (float): Right end of the interval.
+            tol (float): Resolution for extremum locations and threshold for a flat slope.
+            samples (int): Number of points in the coarse grid.
+        Returns:
+            IntervalAnalysis: Intervals, extrema with error bounds, symmetry and evaluation count.
+        """
+        analysis = adaptive_analysis(self, start, end, tol, samples)
+        self._intervals_of_increase = analysis.increasing
+        self._intervals_of_decrease = analysis.decreasing
+        self._intervals_of_constant = analysis.constant
+        return analysis
 
     def _merge_intervals(self, pairs):
         """Takes list of pairs and merges overlaping pairs
@@ -256,20 +444,30 @@ class Function(Relation):
 
         return list(merged)
 
-    def is_increasing(self):
+    def _covers_domain(self, intervals) -> bool:
+        """Do the merged intervals span the whole domain of the pairs as one interval?"""
+        if len(self.pairs) < 2:
+            return False
+        domain = self.domain
+        return self._merge_intervals(intervals) == [(min(domain), max(domain))]
+
+    def is_increasing(self) -> bool:
         """
-        Check if the function is increasing (not implemented).
+        Check if the function is strictly increasing over [min x, max x] of its pairs.
         """
+        return self._covers_domain(self.intervals_of_increase())
 
-    def is_decreasing(self):
+    def is_decreasing(self) -> bool:
         """
-        Check if the function is decreasing (not implemented).
+        Check if the function is strictly decreasing over [min x, max x] of its pairs.
         """
+        return self._covers_domain(self.intervals_of_decrease())
 
-    def is_constant(self):
+    def is_constant(self) -> bool:
         """
-        Check if the function is constant (not implemented).
+        Check if the function is constant over [min x, max x] of its pairs.
         """
+        return self._covers_domain(self.intervals_are_constant())
 
     # is_bounded
     # is_bounded_above
@@ -0,0 +1,128 @@
+"""
+interpolation.py
+
+Defines the Interpolator class for evaluating a sampled function between its sample points.
+
+The x values are sorted and every segment's polynomial coefficients are computed once up
+front, so each query is a bisect for the segment (O(log n)) followed by a Horner evaluation.
+Supported modes:
+- 'nearest': the y of the closest sample.
+- 'linear': piecewise-linear through the samples.
+- 'monotone': monotone piecewise cubic Hermite (Fritsch–Carlson), never overshoots the data.
+- 'spline': natural cubic spline, twice continuously differentiable with S'' = 0 at the ends.
+"""
+from bisect import bisect_right
+from typing import Any, Iterable, List, Tuple
+
+MODES = ('nearest', 'linear', 'monotone', 'spline')
+
+
+def _hermite_coefficients(h: List[float], delta: List[float], slopes: List[float]) -> List[Tuple[float, float, float]]:
+    """Cubic coefficients of each segment from the slopes at its two ends"""
+    coefficients = []
+    for k, (width, secant) in enumerate(zip(h, delta)):
+        d0, d1 = slopes[k], slopes[k + 1]
+        coefficients.append((d0, (3 * secant - 2 * d0 - d1) / width, (d0 + d1 - 2 * secant) / (width * width)))
+    return coefficients
+
+
+def _monotone_slopes(h: List[float], delta: List[float]) -> List[float]:
+    """Fritsch–Carlson slopes: weighted harmonic means inside, shape-preserving three-point ends"""
+    if len(delta) == 1:
+        return [delta[0], delta[0]]
+    slopes = [0.0] * (len(delta) + 1)
+    for k in range(1, len(delta)):
+        if delta[k - 1] * delta[k] > 0:
+            w1 = 2 * h[k] + h[k - 1]
+            w2 = h[k] + 2 * h[k - 1]
+            slopes[k] = (w1 + w2) / (w1 / delta[k - 1] + w2 / delta[k])
+    for end, (h0, h1, d0, d1) in ((0, (h[0], h[1], delta[0], delta[1])),
+                                  (-1, (h[-1], h[-2], delta[-1], delta[-2]))):
+        slope = ((2 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+        if slope * d0 <= 0:
+            slope = 0.0
+        elif d0 * d1 <= 0 and abs(slope) > 3 * abs(d0):
+            slope = 3 * d0
+        slopes[end] = slope
+    return slopes
+
+
+def _natural_spline_coefficients(h: List[float], delta: List[float]) -> List[Tuple[float, float, float]]:
+    """Solve the tridiagonal system for second derivatives with M0 = Mn = 0 (Thomas algorithm)"""
+    n = len(delta)
+    second = [0.0] * (n + 1)
+    if n > 1:
+        diagonal = [2 * (h[k - 1] + h[k]) for k in range(1, n)]
+        rhs = [6 * (delta[k] - delta[k - 1]) for k in range(1, n)]
+        for i in range(1, n - 1):
+            factor = h[i] / diagonal[i - 1]
+            diagonal[i] -= factor * h[i]
+            rhs[i] -= factor * rhs[i - 1]
+        for i in range(n - 2, -1, -1):
+            second[i + 1] = (rhs[i] - h[i + 1] * second[i + 2]) / diagonal[i]
+    return [(delta[k] - h[k] * (2 * second[k] + second[k + 1]) / 6,
+             second[k] / 2,
+             (second[k + 1] - second[k]) / (6 * h[k])) for k in range(n)]
+
+
+class Interpolator:
+    """Answers f(x) anywhere in [min x, max x] from sampled (x, y) pairs"""
+
+    def __init__(self, pairs: Iterable[Tuple[Any, Any]], mode: str = 'linear', tol: float = 1e-9):
+        """
+        Sort the samples and precompute every segment's coefficients.
+
+        Args:
+            pairs: The (x, y) samples; x values must be distinct numbers, and y values numbers
+                unless mode is 'nearest'.
+            mode (str): One of 'nearest', 'linear', 'monotone' or 'spline'.
+            tol (float): Queries within tol of a sample x return that sample's y exactly.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown interpolation mode {mode!r}; expected one of {MODES}")
+        points = sorted(pairs)
+        if len(points) < (1 if mode == 'nearest' else 2):
+            raise ValueError(f"Not enough points to interpolate with mode {mode!r}")
+        self.mode = mode
+        self.tol = tol
+        self.xs = [x for x, _ in points]
+        self.ys = [y for _, y in points]
+        if mode == 'nearest':
+            # nearest never does arithmetic on y, so any y values are allowed
+            self.coefficients = []
+            return
+        h = [x1 - x0 for x0, x1 in zip(self.xs, self.xs[1:])]
+        delta = [(y1 - y0) / width for y0, y1, width in zip(self.ys, self.ys[1:], h)]
+        if mode == 'linear':
+            self.coefficients = [(slope, 0.0, 0.0) for slope in delta]
+        elif mode == 'monotone':
+            self.coefficients = _hermite_coefficients(h, delta, _monotone_slopes(h, delta))
+        else:
+            self.coefficients = _natural_spline_coefficients(h, delta)
+
+    def __call__(self, x: Any) -> Any:
+        """
+        Interpolate at a single x.
+
+        Args:
+            x: A number within [min x - tol, max x + tol].
+        Returns:
+            The interpolated y value.
+        """
+        xs = self.xs
+        if not xs[0] - self.tol <= x <= xs[-1] + self.tol:
+            raise ValueError(f"Value {x} is outside the sampled domain [{xs[0]}, {xs[-1]}]")
+        i = bisect_right(xs, x) - 1
+        if i >= 0 and x - xs[i] <= self.tol:
+            return self.ys[i]
+        if i + 1 < len(xs) and xs[i + 1] - x <= self.tol:
+            return self.ys[i + 1]
+        if self.mode == 'nearest':
+            return self.ys[i] if x - xs[i] <= xs[i + 1] - x else self.ys[i + 1]
+        b, c, d = self.coefficients[i]
+        t = x - xs[i]
+        return self.ys[i] + t * (b + t * (c + t * d))
+
+    def many(self, xs: Iterable) -> List[Any]:
+        """Interpolate at every x of xs, in order"""
+        return [self(x) for x in xs]
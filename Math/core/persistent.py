@@ -0,0 +1,372 @@
+"""
+persistent.py
+
+Defines PersistentSet, an immutable set backed by a hash array mapped trie (HAMT).
+
+Adding or removing an element returns a new set in O(log n) that shares every untouched
+branch of the trie with the original, so derived Relations never need defensive copies.
+
+Also defines PersistentIndex, the immutable x -> {y} index that a Relation extended with
+with_pairs carries forward from its parent instead of rebuilding.
+"""
+from collections.abc import Mapping, Set as AbstractSet
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+
+def _key_hash(key: Any) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _mix(key_hash: int) -> int:
+    """Scramble an element hash so the running sum of a set's hashes does not cancel out"""
+    return ((key_hash ^ (key_hash << 16) ^ 89869747) * 3644798167) & _HASH_MASK
+
+
+def _index(bitmap: int, bit: int) -> int:
+    """Position of bit among the set bits of bitmap"""
+    return (bitmap & (bit - 1)).bit_count()
+
+
+class _Node:
+    """A trie node: keys stored inline under datamap, subtries under nodemap"""
+    __slots__ = ('datamap', 'nodemap', 'keys', 'hashes', 'children')
+
+    def __init__(self, datamap: int, nodemap: int, keys: Tuple, hashes: Tuple, children: Tuple):
+        self.datamap = datamap
+        self.nodemap = nodemap
+        self.keys = keys
+        self.hashes = hashes
+        self.children = children
+
+
+class _Collision:
+    """A leaf holding keys whose full hashes are equal"""
+    __slots__ = ('keys', 'hashes', 'children')
+
+    def __init__(self, keys: Tuple, key_hash: int):
+        self.keys = keys
+        self.hashes = (key_hash,) * len(keys)
+        self.children = ()
+
+
+_EMPTY = _Node(0, 0, (), (), ())
+
+
+def _contains(node, key: Any, key_hash: int, shift: int) -> bool:
+    while True:
+        if isinstance(node, _Collision):
+            return key in node.keys
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if node.datamap & bit:
+            return node.keys[_index(node.datamap, bit)] == key
+        if not node.nodemap & bit:
+            return False
+        node = node.children[_index(node.nodemap, bit)]
+        shift += _BITS
+
+
+def _pair_node(key1: Any, hash1: int, key2: Any, hash2: int, shift: int):
+    """Build the smallest subtrie holding two distinct keys"""
+    if shift >= _HASH_BITS:
+        return _Collision((key1, key2), hash1)
+    bit1 = 1 << ((hash1 >> shift) & _MASK)
+    bit2 = 1 << ((hash2 >> shift) & _MASK)
+    if bit1 == bit2:
+        return _Node(0, bit1, (), (), (_pair_node(key1, hash1, key2, hash2, shift + _BITS),))
+    if bit1 > bit2:
+        key1, hash1, key2, hash2 = key2, hash2, key1, hash1
+    return _Node(bit1 | bit2, 0, (key1, key2), (hash1, hash2), ())
+
+
+def _insert(node, key: Any, key_hash: int, shift: int):
+    """Returns (node, added) where node shares all untouched branches with the input"""
+    if isinstance(node, _Collision):
+        if key in node.keys:
+            return node, False
+        return _Collision(node.keys + (key,), key_hash), True
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    if node.datamap & bit:
+        i = _index(node.datamap, bit)
+        existing = node.keys[i]
+        if existing == key:
+            return node, False
+        child = _pair_node(existing, node.hashes[i], key, key_hash, shift + _BITS)
+        j = _index(node.nodemap, bit)
+        return _Node(node.datamap ^ bit, node.nodemap | bit,
+                     node.keys[:i] + node.keys[i + 1:],
+                     node.hashes[:i] + node.hashes[i + 1:],
+                     node.children[:j] + (child,) + node.children[j:]), True
+    if node.nodemap & bit:
+        j = _index(node.nodemap, bit)
+        child, added = _insert(node.children[j], key, key_hash, shift + _BITS)
+        if not added:
+            return node, False
+        return _Node(node.datamap, node.nodemap, node.keys, node.hashes,
+                     node.children[:j] + (child,) + node.children[j + 1:]), True
+    i = _index(node.datamap, bit)
+    return _Node(node.datamap | bit, node.nodemap,
+                 node.keys[:i] + (key,) + node.keys[i:],
+                 node.hashes[:i] + (key_hash,) + node.hashes[i:],
+                 node.children), True
+
+
+def _remove(node, key: Any, key_hash: int, shift: int):
+    """Returns (node, removed); a subtrie left holding a single key is inlined by its parent"""
+    if isinstance(node, _Collision):
+        if key not in node.keys:
+            return node, False
+        return _Collision(tuple(k for k in node.keys if k != key), key_hash), True
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    if node.datamap & bit:
+        i = _index(node.datamap, bit)
+        if node.keys[i] != key:
+            return node, False
+        return _Node(node.datamap ^ bit, node.nodemap,
+                     node.keys[:i] + node.keys[i + 1:],
+                     node.hashes[:i] + node.hashes[i + 1:],
+                     node.children), True
+    if not node.nodemap & bit:
+        return node, False
+    j = _index(node.nodemap, bit)
+    child, removed = _remove(node.children[j], key, key_hash, shift + _BITS)
+    if not removed:
+        return node, False
+    if not child.children and len(child.keys) == 1:
+        i = _index(node.datamap, bit)
+        return _Node(node.datamap | bit, node.nodemap ^ bit,
+                     node.keys[:i] + child.keys + node.keys[i:],
+                     node.hashes[:i] + child.hashes + node.hashes[i:],
+                     node.children[:j] + node.children[j + 1:]), True
+    return _Node(node.datamap, node.nodemap, node.keys, node.hashes,
+                 node.children[:j] + (child,) + node.children[j + 1:]), True
+
+
+def _build(entries: list, shift: int):
+    """Bulk-build a trie from distinct (hash, key) entries in one pass per level"""
+    if shift >= _HASH_BITS:
+        return _Collision(tuple(key for _, key in entries), entries[0][0])
+    buckets: dict = {}
+    for entry in entries:
+        buckets.setdefault((entry[0] >> shift) & _MASK, []).append(entry)
+    datamap = nodemap = 0
+    keys, hashes, children = [], [], []
+    for chunk in sorted(buckets):
+        bucket = buckets[chunk]
+        if len(bucket) == 1:
+            datamap |= 1 << chunk
+            hashes.append(bucket[0][0])
+            keys.append(bucket[0][1])
+        else:
+            nodemap |= 1 << chunk
+            children.append(_build(bucket, shift + _BITS))
+    return _Node(datamap, nodemap, tuple(keys), tuple(hashes), tuple(children))
+
+
+def _iterate(node) -> Iterator:
+    yield from node.keys
+    for child in node.children:
+        yield from _iterate(child)
+
+
+class PersistentSet(AbstractSet):
+    """An immutable hash set with O(log n) structural-sharing updates and an O(1) derived hash.
+
+    A set built from an iterable is held as a frozenset, which is fast to build and read; the
+    trie is only materialized on the first with_ / without, and every derived set is trie-backed.
+    The derived-set methods deliberately avoid the names of set's mutators (add, discard,
+    update), so code written against a mutable set fails loudly instead of doing nothing.
+    The hash is the sum of scrambled element hashes, which each derived set updates from its
+    parent's, so versions can be used as dict and cache keys without rehashing every element.
+    """
+    __slots__ = ('_flat', '_root', '_size', '_hash_sum')
+
+    def __init__(self, iterable: Optional[Iterable] = None):
+        if isinstance(iterable, PersistentSet):
+            self._flat, self._root = iterable._flat, iterable._root
+        else:
+            self._flat, self._root = frozenset(iterable or ()), None
+        self._size = len(self._flat) if self._flat is not None else iterable._size
+        self._hash_sum: Optional[int] = iterable._hash_sum if isinstance(iterable, PersistentSet) else None
+
+    @classmethod
+    def _from_root(cls, root, size: int, hash_sum: Optional[int]) -> "PersistentSet":
+        new = cls.__new__(cls)
+        new._flat, new._root, new._size, new._hash_sum = None, root, size, hash_sum
+        return new
+
+    def _derived_sum(self, delta: int) -> Optional[int]:
+        """The hash sum of a set derived from this one, unknown until this one's is computed"""
+        return None if self._hash_sum is None else (self._hash_sum + delta) & _HASH_MASK
+
+    @classmethod
+    def _from_iterable(cls, iterable: Iterable) -> "PersistentSet":
+        return cls(iterable)
+
+    def _trie(self):
+        """Returns the trie root, building it from the frozenset on first use"""
+        if self._root is None:
+            entries = [(_key_hash(key), key) for key in self._flat]
+            self._root = _build(entries, 0) if entries else _EMPTY
+            if self._hash_sum is None:
+                self._hash_sum = sum(_mix(key_hash) for key_hash, _ in entries) & _HASH_MASK
+        return self._root
+
+    def __contains__(self, key: Any) -> bool:
+        if self._flat is not None:
+            return key in self._flat
+        try:
+            return _contains(self._root, key, _key_hash(key), 0)
+        except TypeError:
+            return False
+
+    def __iter__(self) -> Iterator:
+        if self._flat is not None:
+            return iter(self._flat)
+        return _iterate(self._root)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __hash__(self) -> int:
+        if self._hash_sum is None:
+            self._hash_sum = sum(_mix(_key_hash(key)) for key in self) & _HASH_MASK
+        return hash((self._size, self._hash_sum))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PersistentSet):
+            if (self._flat is not None and self._flat is other._flat) or \
+                    (self._root is not None and self._root is other._root):
+                return True
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"PersistentSet({set(self)!r})"
+
+    def with_(self, key: Any) -> "PersistentSet":
+        """Return a new set that also holds key, sharing structure with this one"""
+        key_hash = _key_hash(key)
+        root, added = _insert(self._trie(), key, key_hash, 0)
+        return self._from_root(root, self._size + 1, self._derived_sum(_mix(key_hash))) if added else self
+
+    def without(self, key: Any) -> "PersistentSet":
+        """Return a new set without key, sharing structure with this one"""
+        key_hash = _key_hash(key)
+        root, removed = _remove(self._trie(), key, key_hash, 0)
+        return self._from_root(root, self._size - 1, self._derived_sum(-_mix(key_hash))) if removed else self
+
+    def union_all(self, iterable: Iterable) -> "PersistentSet":
+        """Return a new set that also holds every key of iterable"""
+        root = start = self._trie()
+        size = self._size
+        delta = 0
+        for key in iterable:
+            key_hash = _key_hash(key)
+            root, added = _insert(root, key, key_hash, 0)
+            if added:
+                size += 1
+                delta += _mix(key_hash)
+        return self if root is start else self._from_root(root, size, self._derived_sum(delta))
+
+    def __or__(self, other: Any) -> "PersistentSet":
+        if not isinstance(other, AbstractSet):
+            return NotImplemented
+        larger, smaller = (other, self) if len(other) > len(self) else (self, other)
+        if isinstance(larger, PersistentSet) and larger._root is not None:
+            return larger.union_all(smaller)
+        return PersistentSet(frozenset(self).union(other))
+
+    __ror__ = __or__
+
+
+class PersistentIndex(Mapping):
+    """An immutable multimap from key to a set of values, updated in amortized O(log n) per entry.
+
+    Entries live in a stack of dicts whose sizes shrink towards the top. Each update pushes the
+    changed keys as one dict and merges the top two while the upper is at least as large as the
+    one below, like carries in a binary counter, so there are O(log n) layers. A key whose last
+    value is removed is shadowed by an empty set until it is merged into the bottom layer. A
+    layer is never changed once built, so every version shares its layers with the previous one.
+    """
+    __slots__ = ('_layers', '_size')
+
+    def __init__(self, mapping: Optional[Mapping] = None):
+        """Wrap mapping, whose values are sets, as the bottom layer; it must not be mutated afterwards"""
+        self._layers: Tuple[Mapping, ...] = (mapping,) if mapping else ()
+        self._size = len(mapping) if mapping else 0
+
+    def __getitem__(self, key: Any) -> AbstractSet:
+        values = self.get(key)
+        if values is None:
+            raise KeyError(key)
+        return values
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        for layer in reversed(self._layers):
+            values = layer.get(key)
+            if values is not None:
+                return values or default
+        return default
+
+    def __iter__(self) -> Iterator:
+        seen: set = set()
+        for layer in reversed(self._layers):
+            for key, values in layer.items():
+                if key not in seen:
+                    seen.add(key)
+                    if values:
+                        yield key
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extend(self, entries: Iterable[Tuple[Any, Any]]) -> "PersistentIndex":
+        """Return a new index that also maps each key of entries to its value, sharing this index's layers"""
+        top: dict = {}
+        size = self._size
+        for key, value in entries:
+            values = top.get(key)
+            if values is None:
+                values = self.get(key)
+                if values is None:
+                    size += 1
+                    values = frozenset()
+            elif not values:
+                size += 1
+            if value not in values:
+                values = values | {value}
+            top[key] = values
+        return self._push(top, size)
+
+    def retract(self, entries: Iterable[Tuple[Any, Any]]) -> "PersistentIndex":
+        """Return a new index without each (key, value) of entries, sharing this index's layers"""
+        top: dict = {}
+        size = self._size
+        for key, value in entries:
+            values = top[key] if key in top else self.get(key, frozenset())
+            if value in values:
+                values = values - {value}
+                top[key] = values
+                size -= not values
+        return self._push(top, size)
+
+    def _push(self, top: dict, size: int) -> "PersistentIndex":
+        """Stack top on the layers, merging equal-or-smaller layers below it"""
+        if not top:
+            return self
+        layers = list(self._layers)
+        layers.append(top)
+        while len(layers) > 1 and len(layers[-1]) >= len(layers[-2]):
+            upper = layers.pop()
+            merged = dict(layers[-1])
+            merged.update(upper)
+            if len(layers) == 1:
+                merged = {key: values for key, values in merged.items() if values}
+            layers[-1] = merged
+        derived = PersistentIndex.__new__(PersistentIndex)
+        derived._layers, derived._size = tuple(layers), size
+        return derived
@@ -2,15 +2,83 @@
 relation.py
 
 Defines the Relation class and related utilities for representing mathematical relations.
+
+Relations are immutable: pairs live in a PersistentSet, so transforms share them by reference
+and with_pair / with_pairs / without_pair derive new relations in O(log n).
 """
-from typing import List, Tuple, Any, Optional, Set
+from typing import AbstractSet, List, Tuple, Any, Optional, Set, Dict, Iterable, Mapping
+from .persistent import PersistentIndex, PersistentSet
 
 
 class Relation:
     """Instantiates an instance of a Relation -- the Parent class to functions"""
 
-    def __init__(self, pairs: Optional[List[Tuple[Any, Any]]] = None):
-        self.pairs: Set[Tuple[Any, Any]] = set(pairs) if pairs else set()
+    def __init__(self, pairs: Optional[Iterable[Tuple[Any, Any]]] = None):
+        self._pairs = pairs if isinstance(pairs, PersistentSet) else PersistentSet(pairs)
+        self._x_index: Optional[Mapping[Any, AbstractSet]] = None
+        self._y_index: Optional[Dict[Any, Set]] = None
+        self._hash: Optional[int] = None
+
+    @property
+    def pairs(self) -> PersistentSet:
+        """Returns the immutable set of (x, y) pairs"""
+        return self._pairs
+
+    def with_pair(self, pair: Tuple[Any, Any]) -> "Relation":
+        """Returns new relation that also holds pair, sharing structure with this one"""
+        return self.with_pairs([pair])
+
+    def with_pairs(self, pairs: Iterable[Tuple[Any, Any]]) -> "Relation":
+        """Return a new relation that also holds pairs, sharing structure with this one.
+
+        The result has the same kind as this relation: a Function keeps its rule and rejects
+        pairs that would give an x a second value. Other subclasses come back as a Relation.
+
+        Args:
+            pairs: An iterable of (x, y) pairs to add.
+        Returns:
+            Relation: The extended relation, or self if every pair was already present.
+            A built x index is carried forward by extending it with just the new pairs."""
+        added = self._admit(pairs)
+        extended = self._share(self._pairs.union_all(added))
+        if extended is not self:
+            extended._x_index = self._carry_index(PersistentIndex.extend, added)
+        return extended
+
+    def without_pair(self, pair: Tuple[Any, Any]) -> "Relation":
+        """Returns new relation without pair, sharing structure with this one; a Function keeps its rule"""
+        pair = tuple(pair)
+        shrunk = self._share(self._pairs.without(pair))
+        if shrunk is not self:
+            shrunk._x_index = self._carry_index(PersistentIndex.retract, [pair])
+        return shrunk
+
+    def _carry_index(self, update, pairs: List[Tuple[Any, Any]]) -> Optional[PersistentIndex]:
+        """Returns this relation's x index updated with pairs, or None if it was never built"""
+        index = self._x_index
+        if index is None:
+            return None
+        if not isinstance(index, PersistentIndex):
+            index = PersistentIndex(index)
+        return update(index, pairs)
+
+    def _admit(self, pairs: Iterable[Tuple[Any, Any]]) -> List[Tuple[Any, Any]]:
+        """Returns the pairs to add as tuples; subclasses validate them here"""
+        return [tuple(pair) for pair in pairs]
+
+    def _share(self, pairs: PersistentSet) -> "Relation":
+        """Returns a relation of the same kind over pairs, or self when pairs are unchanged"""
+        return self if pairs is self._pairs else Relation(pairs)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._pairs == other._pairs
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((type(self).__name__, self._pairs))
+        return self._hash
 
     def get_value_for(self, x_input: Any) -> Any:
         """Return the first y output corresponding with x_input.
@@ -20,12 +88,11 @@ class Relation:
         Returns: 
             The first of y values corresponding with x_input y1."""
         try:
-            for x, y in self.pairs:
-                if x == x_input:
-                    return y
+            y_vals = self._index_by_x().get(x_input)
         except Exception as exc:
             raise ValueError(
                 f"Value {x_input} not found in the domain of this relation") from exc
+        return next(iter(y_vals)) if y_vals else None
 
     def get_all_values_for(self, x_input: Any) -> Set:
         """Return the set of y outputs corresponding with x_input.
@@ -34,12 +101,8 @@ class Relation:
             x_input (val): one of the x values within the set of this relation.
         Returns: 
             Set of y values corresponding with x_input {y1, y2, y3}."""
-        y_vals = []
         try:
-            for x, y in self.pairs:
-                if x == x_input:
-                    y_vals.append(y)
-            return set(y_vals)
+            return set(self._index_by_x().get(x_input, ()))
         except Exception as exc:
             raise ValueError(
                 f"Value {x_input} not found in the domain of this relation") from exc
@@ -59,6 +122,242 @@ class Relation:
         """Returns new instance of class Relation with inversed pairs"""
         return Relation([pair[::-1] for pair in self.pairs])
 
+    def _index_by_x(self) -> Mapping[Any, AbstractSet]:
+        """Returns a hash index mapping each x to the set of its y values, built once per relation"""
+        if self._x_index is None:
+            index: Dict[Any, Set] = {}
+            for x, y in self.pairs:
+                index.setdefault(x, set()).add(y)
+            self._x_index = index
+        return self._x_index
+
+    def _index_by_y(self) -> Dict[Any, Set]:
+        """Returns a hash index mapping each y to the set of its x values, built once per relation"""
+        if self._y_index is None:
+            index: Dict[Any, Set] = {}
+            for x, y in self.pairs:
+                index.setdefault(y, set()).add(x)
+            self._y_index = index
+        return self._y_index
+
+    def compose(self, other: "Relation") -> "Relation":
+        """Return the composition self ∘ other, i.e. {(x, z) : (x, y) in other and (y, z) in self}.
+
+        Implemented as a hash join on the shared middle element y, so the cost is
+        linear in the size of both relations plus the size of the output.
+
+        Args:
+            other (Relation): The inner relation, applied first.
+        Returns:
+            Relation: The composed relation."""
+        by_x = self._index_by_x()
+        composed = set()
+        for x, y in other.pairs:
+            for z in by_x.get(y, ()):
+                composed.add((x, z))
+        return Relation(composed)
+
+    def union(self, other: "Relation") -> "Relation":
+        """Returns new Relation containing the pairs of either relation"""
+        return Relation(self.pairs | other.pairs)
+
+    def intersection(self, other: "Relation") -> "Relation":
+        """Returns new Relation containing the pairs common to both relations"""
+        return Relation(self.pairs & other.pairs)
+
+    def difference(self, other: "Relation") -> "Relation":
+        """Returns new Relation containing the pairs of self that are not in other"""
+        return Relation(self.pairs - other.pairs)
+
+    def restrict(self, subset: Iterable) -> "Relation":
+        """Return the restriction of this relation to a subset of its domain.
+
+        Args:
+            subset (iterable): The x values to keep.
+        Returns:
+            Relation: The pairs whose x value is in subset."""
+        by_x = self._index_by_x()
+        return Relation([(x, y) for x in set(subset) for y in by_x.get(x, ())])
+
+    def image(self, subset: Iterable) -> Set:
+        """Return the image of a set, i.e. every y related to some x in subset.
+
+        Args:
+            subset (iterable): The x values to map.
+        Returns:
+            Set of y values {y : (x, y) in self, x in subset}."""
+        by_x = self._index_by_x()
+        return {y for x in set(subset) for y in by_x.get(x, ())}
+
+    def preimage(self, subset: Iterable) -> Set:
+        """Return the preimage of a set, i.e. every x related to some y in subset.
+
+        Args:
+            subset (iterable): The y values to pull back.
+        Returns:
+            Set of x values {x : (x, y) in self, y in subset}."""
+        by_y = self._index_by_y()
+        return {x for y in set(subset) for x in by_y.get(y, ())}
+
+    def _bitset_adjacency(self) -> Tuple[List, List[int]]:
+        """Number the elements of domain ∪ range and encode each row of the relation as an int bitset.
+
+        Returns:
+            (elements, rows) where bit j of rows[i] is set iff (elements[i], elements[j]) is a pair."""
+        elements = list(self.domain | self.range)
+        positions = {e: i for i, e in enumerate(elements)}
+        columns: List[List[int]] = [[] for _ in elements]
+        for x, y in self.pairs:
+            columns[positions[x]].append(positions[y])
+        rows = []
+        for row_columns in columns:
+            bits = 0
+            for j in row_columns:
+                bits |= 1 << j
+            rows.append(bits)
+        return elements, rows
+
+    @staticmethod
+    def _bits(bitset: int):
+        """Yields the index of every set bit, lowest first"""
+        while bitset:
+            low = bitset & -bitset
+            yield low.bit_length() - 1
+            bitset ^= low
+
+    def is_reflexive(self, universe: Optional[Iterable] = None) -> bool:
+        """Does every element of the underlying set relate to itself?
+
+        Args:
+            universe (iterable, optional): The underlying set. Defaults to domain ∪ range."""
+        elements = set(universe) if universe is not None else self.domain | self.range
+        return all((e, e) in self.pairs for e in elements)
+
+    @property
+    def is_symmetric(self) -> bool:
+        """Does (x, y) imply (y, x)?"""
+        return all((y, x) in self.pairs for x, y in self.pairs)
+
+    @property
+    def is_antisymmetric(self) -> bool:
+        """Do (x, y) and (y, x) together imply x == y?"""
+        return all(x == y or (y, x) not in self.pairs for x, y in self.pairs)
+
+    @property
+    def is_transitive(self) -> bool:
+        """Do (x, y) and (y, z) imply (x, z)? Every successor's row must be a subset of the row"""
+        by_x = self._index_by_x()
+        empty: Set = set()
+        return all(by_x.get(y, empty) <= ys for ys in by_x.values() for y in ys)
+
+    def is_equivalence(self, universe: Optional[Iterable] = None) -> bool:
+        """Is the relation reflexive, symmetric and transitive?
+
+        Args:
+            universe (iterable, optional): The underlying set. Defaults to domain ∪ range."""
+        return self.is_reflexive(universe) and self.is_symmetric and self.is_transitive
+
+    def transitive_closure(self) -> "Relation":
+        """Return the smallest transitive relation containing this one.
+
+        Strongly connected components are found with an iterative Tarjan search and
+        reachability is accumulated as int bitsets over the condensation, which Tarjan
+        already emits in reverse topological order.
+
+        Returns:
+            Relation: The transitive closure R+."""
+        elements, rows = self._bitset_adjacency()
+        n = len(elements)
+        successors = [list(self._bits(row)) for row in rows]
+
+        component = [-1] * n
+        index = [-1] * n
+        lowlink = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                v, i = work.pop()
+                if i == 0:
+                    index[v] = lowlink[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = True
+                elif i <= len(successors[v]):
+                    w = successors[v][i - 1]
+                    if component[w] == -1:
+                        lowlink[v] = min(lowlink[v], lowlink[w])
+                descended = False
+                while i < len(successors[v]):
+                    w = successors[v][i]
+                    i += 1
+                    if index[w] == -1:
+                        work.append((v, i))
+                        work.append((w, 0))
+                        descended = True
+                        break
+                    if on_stack[w]:
+                        lowlink[v] = min(lowlink[v], index[w])
+                if descended:
+                    continue
+                if lowlink[v] == index[v]:
+                    members = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component[w] = len(components)
+                        members.append(w)
+                        if w == v:
+                            break
+                    components.append(members)
+
+        reach = [0] * len(components)
+        for c, members in enumerate(components):
+            member_bits = 0
+            for v in members:
+                member_bits |= 1 << v
+            bits = 0
+            for v in members:
+                bits |= rows[v]
+                for w in successors[v]:
+                    if component[w] != c:
+                        bits |= reach[component[w]]
+            if len(members) > 1:
+                bits |= member_bits
+            reach[c] = bits
+
+        return Relation([(elements[v], elements[w])
+                         for v in range(n) for w in self._bits(reach[component[v]])])
+
+    def equivalence_classes(self) -> List[Set]:
+        """Return the equivalence classes of an equivalence relation, found with union-find.
+
+        Returns:
+            List of sets partitioning domain ∪ range."""
+        if not self.is_equivalence():
+            raise ValueError("Relation is not an equivalence relation")
+        parent = {e: e for e in self.domain}
+
+        def find(e):
+            while parent[e] != e:
+                parent[e] = parent[parent[e]]
+                e = parent[e]
+            return e
+
+        for x, y in self.pairs:
+            root_x, root_y = find(x), find(y)
+            if root_x != root_y:
+                parent[root_x] = root_y
+        classes: Dict[Any, Set] = {}
+        for e in parent:
+            classes.setdefault(find(e), set()).add(e)
+        return list(classes.values())
+
     @property
     def is_function(self) -> bool:
         """The Vertical line test: Does each x have exactly one y?"""
@@ -0,0 +1,241 @@
+"""
+sampling.py
+
+Adaptive sampling analysis of a Function's rule on a continuous interval.
+
+A coarse uniform grid is evaluated in one batch, and only the grid segments where the slope
+changes sign are refined, so monotonicity intervals, extrema and symmetry come out with error
+bounds at a small fraction of the cost of dense sampling. When the rule accepts Dual numbers
+the slope is its exact derivative and turning points are found by bisection on f'; otherwise,
+including when any evaluation returns a plain value instead of a Dual or the derivative
+itself is undefined (sqrt at 0), slopes come from adjacent samples and turning points from a
+golden-section search.
+"""
+import math
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+from .dual import value_and_derivative
+
+_INV_PHI = (math.sqrt(5) - 1) / 2
+
+
+class Extremum(NamedTuple):
+    """A local extremum located to within x_error of x"""
+    x: float
+    y: Any
+    kind: str
+    x_error: float
+
+
+class IntervalAnalysis(NamedTuple):
+    """Result of Function.analyze_interval"""
+    increasing: List[Tuple[float, float]]
+    decreasing: List[Tuple[float, float]]
+    constant: List[Tuple[float, float]]
+    extrema: List[Extremum]
+    boundary_error: float
+    symmetry: Optional[str]
+    symmetry_residual: Optional[float]
+    evaluations: int
+
+
+class _CountingEvaluator:
+    """Wraps a Function so every rule evaluation is counted"""
+
+    def __init__(self, func):
+        self.func = func
+        self.evaluations = 0
+
+    def __call__(self, x):
+        self.evaluations += 1
+        return self.func(x)
+
+    def many(self, xs: List[float]) -> List[Any]:
+        self.evaluations += len(xs)
+        return self.func.evaluate_many(xs)
+
+    def with_derivative(self, x: float) -> Tuple[Any, Any]:
+        self.evaluations += 1
+        return value_and_derivative(self.func, x, strict=True)
+
+
+def _grid(start: float, end: float, samples: int) -> List[float]:
+    step = (end - start) / (samples - 1)
+    return [start] + [start + i * step for i in range(1, samples - 1)] + [end]
+
+
+def _sign(delta, tol: float) -> int:
+    if abs(delta) <= tol:
+        return 0
+    return 1 if delta > 0 else -1
+
+
+def _golden_section(evaluate: Callable, lo: float, hi: float, kind: str, tol: float) -> Tuple[float, Any, float]:
+    """Narrow [lo, hi] around its maximum or minimum until it is narrower than 2 * tol.
+
+    Returns:
+        (x, f(x), half width of the final bracket)"""
+    better = (lambda a, b: a > b) if kind == 'maximum' else (lambda a, b: a < b)
+    c = hi - _INV_PHI * (hi - lo)
+    d = lo + _INV_PHI * (hi - lo)
+    fc, fd = evaluate(c), evaluate(d)
+    while hi - lo > 2 * tol:
+        if better(fc, fd):
+            hi, d, fd = d, c, fc
+            c = hi - _INV_PHI * (hi - lo)
+            fc = evaluate(c)
+        else:
+            lo, c, fc = c, d, fd
+            d = lo + _INV_PHI * (hi - lo)
+            fd = evaluate(d)
+    x = (lo + hi) / 2
+    return x, evaluate(x), (hi - lo) / 2
+
+
+def _runs(signs: List[int]) -> List[Tuple[int, int, int]]:
+    """Collapse per-segment slope signs into (sign, first segment, last segment) runs"""
+    runs = []
+    first = 0
+    for i in range(1, len(signs) + 1):
+        if i == len(signs) or signs[i] != signs[first]:
+            runs.append((signs[first], first, i - 1))
+            first = i
+    return runs
+
+
+def _bisect_slope(evaluator: _CountingEvaluator, lo: float, hi: float, sign_lo: int,
+                  tol: float) -> Tuple[float, Any, float]:
+    """Narrow [lo, hi] around the zero of f' where its sign leaves sign_lo.
+
+    Returns:
+        (x, f(x), half width of the final bracket)"""
+    while hi - lo > 2 * tol:
+        mid = (lo + hi) / 2
+        _, slope = evaluator.with_derivative(mid)
+        if slope == 0:
+            lo = hi = mid
+        elif (slope > 0) == (sign_lo > 0):
+            lo = mid
+        else:
+            hi = mid
+    x = (lo + hi) / 2
+    return x, evaluator(x), (hi - lo) / 2
+
+
+def _analytic_profile(evaluator: _CountingEvaluator, xs: List[float], ys: List[Any],
+                      slopes: List[Any], tol: float) -> Tuple[List[Tuple[int, float, float]], List[Extremum]]:
+    """Classify the grid by the sign of the exact derivative at each node.
+
+    Returns:
+        (runs, extrema) where runs are merged (sign, lo, hi) intervals"""
+    signs = [_sign(slope, tol) for slope in slopes]
+    extrema = []
+    runs: List[List] = []
+    for i in range(len(xs) - 1):
+        sign0, sign1 = signs[i], signs[i + 1]
+        if sign0 and sign1 and sign0 != sign1:
+            x, y, error = _bisect_slope(evaluator, xs[i], xs[i + 1], sign0, tol)
+            extrema.append(Extremum(x, y, 'maximum' if sign0 > 0 else 'minimum', error))
+            pieces = [(sign0, xs[i], x), (sign1, x, xs[i + 1])]
+        else:
+            pieces = [(sign0 or sign1, xs[i], xs[i + 1])]
+        for sign, lo, hi in pieces:
+            if runs and runs[-1][0] == sign:
+                runs[-1][2] = hi
+            else:
+                if runs and runs[-1][0] and sign == -runs[-1][0] and not (extrema and extrema[-1].x == lo):
+                    node = xs.index(lo)
+                    extrema.append(Extremum(lo, ys[node], 'maximum' if sign < 0 else 'minimum', 0.0))
+                runs.append([sign, lo, hi])
+    return [tuple(run) for run in runs], extrema
+
+
+def _sampled_profile(evaluator: _CountingEvaluator, xs: List[float], ys: List[Any],
+                     tol: float) -> Tuple[List[Tuple[int, float, float]], List[Extremum]]:
+    """Classify the grid by the sign of the difference between adjacent samples.
+
+    Returns:
+        (runs, extrema) where runs are merged (sign, lo, hi) intervals"""
+    signs = [_sign(y1 - y0, tol) for y0, y1 in zip(ys, ys[1:])]
+    segment_runs = _runs(signs)
+    boundaries = [xs[0]]
+    extrema = []
+    for (sign0, _, last0), (sign1, _, _) in zip(segment_runs, segment_runs[1:]):
+        if sign0 and sign1:
+            kind = 'maximum' if sign0 > 0 else 'minimum'
+            x, y, error = _golden_section(evaluator, xs[last0], xs[last0 + 2], kind, tol)
+            extrema.append(Extremum(x, y, kind, error))
+            boundaries.append(x)
+        else:
+            boundaries.append(xs[last0 + 1])
+    boundaries.append(xs[-1])
+    runs = [(sign, lo, hi) for (sign, _, _), lo, hi in zip(segment_runs, boundaries, boundaries[1:])]
+    return runs, extrema
+
+
+def _plateau_extrema(evaluator: _CountingEvaluator, runs: List[Tuple[int, float, float]]) -> List[Extremum]:
+    """A flat run between opposite slopes is an extremum reached all along it; report its midpoint"""
+    extrema = []
+    for (before, _, _), (sign, lo, hi), (after, _, _) in zip(runs, runs[1:], runs[2:]):
+        if sign == 0 and before and after == -before:
+            x = (lo + hi) / 2
+            extrema.append(Extremum(x, evaluator(x), 'minimum' if before < 0 else 'maximum', (hi - lo) / 2))
+    return extrema
+
+
+def _symmetry(evaluator: _CountingEvaluator, xs: List[float], ys: List[Any],
+              start: float, end: float, samples: int, tol: float) -> Tuple[Optional[str], Optional[float]]:
+    """Compare f(x) with f(-x) over the part of the interval that is symmetric about 0"""
+    if not start < 0 < end:
+        return None, None
+    if math.isclose(start, -end, abs_tol=tol):
+        left, right = ys, ys[::-1]
+    else:
+        half = min(-start, end)
+        grid = _grid(0, half, (samples + 1) // 2)
+        left = evaluator.many(grid)
+        right = evaluator.many([-x for x in grid])
+    even_residual = max(abs(a - b) for a, b in zip(left, right))
+    odd_residual = max(abs(a + b) for a, b in zip(left, right))
+    if even_residual <= tol:
+        return 'even', even_residual
+    if odd_residual <= tol:
+        return 'odd', odd_residual
+    return 'neither', min(even_residual, odd_residual)
+
+
+def adaptive_analysis(func, start: float, end: float, tol: float = 1e-6, samples: int = 65) -> IntervalAnalysis:
+    """Analyze monotonicity, extrema and symmetry of func on [start, end].
+
+    Args:
+        func (Function): The function to analyze; only its rule (or __call__) is used.
+        start (float): Left end of the interval.
+        end (float): Right end of the interval.
+        tol (float): Resolution for extremum locations and threshold for a flat slope.
+        samples (int): Number of points in the coarse grid.
+    Returns:
+        IntervalAnalysis: Intervals, extrema with x error bounds, symmetry and evaluation count."""
+    if not start < end:
+        raise ValueError("Interval start must be less than its end")
+    if samples < 3:
+        raise ValueError("At least 3 samples are required")
+
+    evaluator = _CountingEvaluator(func)
+    xs = _grid(start, end, samples)
+    step = (end - start) / (samples - 1)
+    try:
+        if func.rule is None:
+            raise ValueError("Function has no rule to differentiate")
+        ys, slopes = zip(*(evaluator.with_derivative(x) for x in xs))
+        runs, extrema = _analytic_profile(evaluator, xs, list(ys), list(slopes), tol)
+    except (TypeError, ValueError, ArithmeticError):
+        ys = evaluator.many(xs)
+        runs, extrema = _sampled_profile(evaluator, xs, ys, tol)
+
+    extrema = sorted(extrema + _plateau_extrema(evaluator, runs), key=lambda extremum: extremum.x)
+    intervals = {1: [], -1: [], 0: []}
+    for sign, lo, hi in runs:
+        intervals[sign].append((lo, hi))
+
+    symmetry, residual = _symmetry(evaluator, xs, ys, start, end, samples, tol)
+    return IntervalAnalysis(intervals[1], intervals[-1], intervals[0], extrema,
+                            step, symmetry, residual, evaluator.evaluations)
@@ -0,0 +1,137 @@
+"""
+sharding.py
+
+Validates huge streams of pairs across worker processes, exactly or approximately.
+
+Exact mode hash-partitions the stream twice: by x, so every pair sharing an x lands on the
+same worker and the vertical line test can run shard by shard, and by y for the horizontal
+line test. No single process ever holds the whole domain or range, and the parent only
+buffers one chunk per worker at a time.
+
+Approximate mode makes one pass with two HyperLogLog sketches, estimating the size of the
+domain and range in a few KB so ingestion can pre-screen data before exact validation.
+"""
+import multiprocessing
+import queue
+from typing import Any, Iterable, List, NamedTuple, Tuple
+
+from .sketch import HyperLogLog
+
+
+class ShardedValidation(NamedTuple):
+    """Result of validate_sharded"""
+    is_function: bool
+    is_one_to_one: bool
+    pair_count: int
+    domain_size: int
+    range_size: int
+
+
+def _validate_shard(inbox, outbox) -> None:
+    """Worker loop: run both line tests on the pairs routed to this shard"""
+    y_for_x: dict = {}
+    x_for_y: dict = {}
+    extra_pairs: set = set()
+    function_ok = one_to_one_ok = True
+    while True:
+        batch = inbox.get()
+        if batch is None:
+            break
+        by_x, by_y = batch
+        for x, y in by_x:
+            if y_for_x.setdefault(x, y) != y:
+                function_ok = False
+                extra_pairs.add((x, y))
+        for x, y in by_y:
+            if x_for_y.setdefault(y, x) != x:
+                one_to_one_ok = False
+    outbox.put((function_ok, one_to_one_ok, len(y_for_x) + len(extra_pairs), len(y_for_x), len(x_for_y)))
+
+
+def _check_workers(workers: List) -> None:
+    """Raise if any worker died, instead of waiting forever on its queue"""
+    if any(worker.exitcode not in (None, 0) for worker in workers):
+        raise RuntimeError("A validation worker exited unexpectedly")
+
+
+def _send(inbox, item: Any, workers: List, timeout: float) -> None:
+    """Put item on a bounded inbox, checking worker liveness every timeout seconds while it is full"""
+    while True:
+        try:
+            inbox.put(item, timeout=timeout)
+            return
+        except queue.Full:
+            _check_workers(workers)
+
+
+def validate_sharded(pairs: Iterable[Tuple[Any, Any]], shards: int = 4, chunk_size: int = 10_000,
+                     timeout: float = 5.0) -> ShardedValidation:
+    """
+    Run the vertical and horizontal line tests on a stream of pairs across worker processes.
+
+    Args:
+        pairs: An iterable of (x, y) pairs; duplicates are ignored, as in Relation.
+        shards (int): Number of worker processes.
+        chunk_size (int): Pairs buffered per worker before they are sent.
+        timeout (float): Seconds between liveness checks while waiting on a full inbox or for results.
+    Returns:
+        ShardedValidation: Exact is_function, is_one_to_one and distinct counts.
+    Raises:
+        RuntimeError: If a worker process dies before reporting its result.
+    """
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue(maxsize=4) for _ in range(shards)]
+    outbox = context.Queue()
+    workers = [context.Process(target=_validate_shard, args=(inbox, outbox), daemon=True)
+               for inbox in inboxes]
+    for worker in workers:
+        worker.start()
+    try:
+        by_x: List[list] = [[] for _ in range(shards)]
+        by_y: List[list] = [[] for _ in range(shards)]
+        for x, y in pairs:
+            x_shard, y_shard = hash(x) % shards, hash(y) % shards
+            by_x[x_shard].append((x, y))
+            by_y[y_shard].append((x, y))
+            for shard in (x_shard, y_shard):
+                if len(by_x[shard]) + len(by_y[shard]) >= chunk_size:
+                    _send(inboxes[shard], (by_x[shard], by_y[shard]), workers, timeout)
+                    by_x[shard], by_y[shard] = [], []
+        for shard, inbox in enumerate(inboxes):
+            _send(inbox, (by_x[shard], by_y[shard]), workers, timeout)
+            _send(inbox, None, workers, timeout)
+        results = []
+        while len(results) < shards:
+            try:
+                results.append(outbox.get(timeout=timeout))
+            except queue.Empty:
+                _check_workers(workers)
+    finally:
+        for worker in workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+    return ShardedValidation(all(r[0] for r in results), all(r[1] for r in results),
+                             sum(r[2] for r in results), sum(r[3] for r in results),
+                             sum(r[4] for r in results))
+
+
+def sketch_pairs(pairs: Iterable[Tuple[Any, Any]], precision: int = 14) -> Tuple[HyperLogLog, HyperLogLog]:
+    """
+    Sketch the domain and range of a stream of pairs in one pass.
+
+    Sketches of separate shards can be combined with HyperLogLog.merge.
+
+    Args:
+        pairs: An iterable of (x, y) pairs.
+        precision (int): HyperLogLog precision of both sketches.
+    Returns:
+        (domain sketch, range sketch)
+    """
+    domain, range_ = HyperLogLog(precision), HyperLogLog(precision)
+    for x, y in pairs:
+        domain.add(x)
+        range_.add(y)
+    return domain, range_
@@ -0,0 +1,67 @@
+"""
+sketch.py
+
+Defines HyperLogLog, a fixed-size sketch that estimates how many distinct values it has seen.
+
+With precision p the sketch keeps 2**p one-byte registers (16 KB at the default p = 14) and
+estimates cardinality with a relative standard error of about 1.04 / sqrt(2**p), roughly 0.8%.
+Values are hashed with BLAKE2b over their repr, so sketches built in different processes agree
+and can be merged; note that equal values with different reprs (1 and 1.0) count separately.
+"""
+import hashlib
+import math
+from typing import Any, Iterable
+
+
+class HyperLogLog:
+    """A mergeable distinct-count sketch"""
+
+    def __init__(self, precision: int = 14):
+        """
+        Create an empty sketch.
+
+        Args:
+            precision (int): Number of index bits p, between 4 and 18; uses 2**p bytes.
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        """Record one value"""
+        digest = int.from_bytes(hashlib.blake2b(repr(value).encode(), digest_size=8).digest(), 'big')
+        index = digest >> (64 - self.precision)
+        remaining = digest & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable) -> "HyperLogLog":
+        """Record every value and return the sketch"""
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Return a new sketch of the union of both sketches' values"""
+        if other.precision != self.precision:
+            raise ValueError("Only sketches with the same precision can be merged")
+        merged = HyperLogLog(self.precision)
+        merged.registers = bytearray(map(max, self.registers, other.registers))
+        return merged
+
+    __or__ = merge
+
+    def estimate(self) -> float:
+        """Returns the estimated number of distinct values seen"""
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / math.fsum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+    def __len__(self) -> int:
+        return round(self.estimate())
@@ -0,0 +1,87 @@
+from concurrent.futures import ProcessPoolExecutor
+from Math.core.cache import EvaluationCache
+from Math.core.functions import Function
+from Math.algebra.linearFunction import LinearFunction
+
+
+def square(x):
+    return x * x
+
+
+def build_pipeline():
+    return Function(rule=square).compose(LinearFunction(2, 1)).vertical_shift(3)
+
+
+def fill_cache(path, start):
+    with EvaluationCache(path) as cache:
+        return cache.evaluate_many(build_pipeline(), range(start, start + 200))
+
+
+def test_fingerprint_is_structural():
+    assert build_pipeline().fingerprint == build_pipeline().fingerprint
+    assert build_pipeline().fingerprint != build_pipeline().vertical_shift(1).fingerprint
+    assert LinearFunction(2, 1).fingerprint != LinearFunction(2, 2).fingerprint
+    assert Function(pairs=[(1, 2), (3, 4)]).fingerprint == Function(pairs=[(3, 4), (1, 2)]).fingerprint
+    assert build_pipeline().compile().fingerprint == build_pipeline().fingerprint
+
+
+def test_fingerprint_includes_captured_values():
+    def shifted_by(k):
+        return Function(rule=lambda x: x + k)
+
+    assert shifted_by(1).fingerprint == shifted_by(1).fingerprint
+    assert shifted_by(1).fingerprint != shifted_by(2).fingerprint
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / 'evaluations.db')
+
+    with EvaluationCache(path) as cache:
+        assert cache.evaluate_many(build_pipeline(), [1, 2, 3]) == [12, 28, 52]
+    with EvaluationCache(path) as cache:
+        assert cache.get_many(build_pipeline(), [1, 2, 3, 4]) == {1: 12, 2: 28, 3: 52}
+        assert cache.evaluate_many(build_pipeline(), [3, 2, 1, 4]) == [52, 28, 12, 84]
+        assert len(cache) == 4
+
+
+def test_cache_batch_read_and_write(tmp_path):
+    f = build_pipeline()
+    with EvaluationCache(str(tmp_path / 'evaluations.db')) as cache:
+        cache.put_many(f, [(x, f(x)) for x in range(1000)])
+
+        found = cache.get_many(f, range(990, 1010))
+        assert found == {x: f(x) for x in range(990, 1000)}
+        assert cache.get_many(LinearFunction(1, 0), range(10)) == {}
+
+
+def test_cache_keeps_equal_inputs_with_different_reprs_apart(tmp_path):
+    f = Function(rule=lambda x: type(x).__name__)
+    with EvaluationCache(str(tmp_path / 'evaluations.db')) as cache:
+        assert cache.evaluate_many(f, [1, 1.0, 1]) == ['int', 'float', 'int']
+        assert cache.evaluate_many(f, [1.0, 1]) == ['float', 'int']
+        assert len(cache) == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    f = build_pipeline()
+    with EvaluationCache(str(tmp_path / 'evaluations.db'), max_entries=10) as cache:
+        cache.put_many(f, [(x, f(x)) for x in range(10)])
+        cache.get_many(f, [0])
+        cache.put_many(f, [(10, f(10))])
+
+        assert len(cache) == 10
+        assert 0 in cache.get_many(f, range(11))
+        assert 10 in cache.get_many(f, range(11))
+
+
+def test_cache_concurrent_processes(tmp_path):
+    path = str(tmp_path / 'evaluations.db')
+    EvaluationCache(path).close()
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(fill_cache, [path] * 4, [0, 100, 200, 300]))
+
+    f = build_pipeline()
+    assert results[0] == [f(x) for x in range(200)]
+    with EvaluationCache(path) as cache:
+        assert len(cache) == 500
+        assert cache.get_many(f, range(500)) == {x: f(x) for x in range(500)}
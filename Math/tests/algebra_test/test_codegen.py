@@ -0,0 +1,41 @@
+from Math.core.codegen import generate_source, _factory_for
+from Math.core.functions import Function
+from Math.algebra.linearFunction import LinearFunction
+
+
+def build_pipeline(leaf_rule):
+    leaf = Function(rule=leaf_rule)
+    line = LinearFunction(2, 1)
+    return (leaf.compose(line) + leaf.compose(line)).vertical_shift(3) / line
+
+
+def test_generate_source_inlines_constants_and_hoists_shared_calls():
+    source, params = generate_source(build_pipeline(lambda x: x * x))
+
+    assert params and len(params) == 1
+    assert source.count('_p0(') == 2  # once in the scalar body, once in the batch loop
+    assert '2.0 * x + 1.0' in source
+    assert '+ 3' in source
+
+
+def test_identical_structure_reuses_compiled_code():
+    first, first_params = generate_source(build_pipeline(lambda x: x * x))
+    second, second_params = generate_source(build_pipeline(abs))
+
+    assert first == second
+    assert first_params != second_params
+    assert _factory_for(first) is _factory_for(second)
+
+
+def test_different_constants_generate_different_code():
+    shifted_once = Function(rule=abs).vertical_shift(1)
+    shifted_twice = Function(rule=abs).vertical_shift(2)
+
+    assert generate_source(shifted_once)[0] != generate_source(shifted_twice)[0]
+
+
+def test_non_numeric_constants_are_bound_as_parameters():
+    source, params = generate_source(Function.constant(c='seven'))
+
+    assert "'seven'" not in source
+    assert 'seven' in params
@@ -0,0 +1,48 @@
+import pytest
+import math
+from Math.core import dual
+from Math.core.dual import Dual, value_and_derivative
+
+
+def test_dual_arithmetic_rules():
+    x = Dual(3.0, 1.0)
+
+    assert (x * x).deriv == 6.0
+    assert (2 * x + 1).deriv == 2.0
+    assert (1 - x).deriv == -1.0
+    assert (1 / x).deriv == -1 / 9
+    assert (x / 2).deriv == 0.5
+    assert (x ** 3).deriv == 27.0
+    assert (-x).deriv == -1.0
+
+
+def test_dual_powers_with_dual_exponent():
+    value, deriv = value_and_derivative(lambda x: 2 ** x, 3.0)
+    assert value == 8.0
+    assert math.isclose(deriv, 8 * math.log(2))
+
+    value, deriv = value_and_derivative(lambda x: x ** x, 2.0)
+    assert value == 4.0
+    assert math.isclose(deriv, 4 * (math.log(2) + 1))
+
+
+def test_dual_elementary_functions():
+    assert math.isclose(value_and_derivative(dual.sin, 0.5)[1], math.cos(0.5))
+    assert math.isclose(value_and_derivative(dual.exp, 1.0)[1], math.e)
+    assert math.isclose(value_and_derivative(dual.log, 4.0)[1], 0.25)
+    assert math.isclose(value_and_derivative(dual.sqrt, 4.0)[1], 0.25)
+    assert dual.cos(0.0) == 1.0
+
+
+def test_dual_comparisons_use_value():
+    x = Dual(2.0, 1.0)
+
+    assert x > 1 and x >= 2 and x < 3 and x == 2
+    assert abs(Dual(-2.0, 1.0)).deriv == -1.0
+    assert value_and_derivative(lambda x: max(0, x), -1.0) == (0, 0.0)
+
+
+def test_value_and_derivative_of_constant():
+    assert value_and_derivative(lambda x: 7, 1.0) == (7, 0.0)
+    with pytest.raises(TypeError):
+        value_and_derivative(lambda x: 7, 1.0, strict=True)
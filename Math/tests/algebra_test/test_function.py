@@ -1,6 +1,8 @@
 import pytest
 from Math.core.functions import Function
 from Math.core.relation import Relation
+from Math.core.persistent import PersistentSet
+from Math.core import dual
 
 functional_rel = Relation([(x, x**2) for x in range(-5, 6)])
 non_function_rel = Relation([(1, 2), (2, 3), (1, 5)])
@@ -109,6 +111,15 @@ def test_check_symmetry_is_neither():
     assert f.return_symmetry_type == 'neither'
 
 
+def test_analyze_interval_keeps_exact_symmetry():
+    f = Function(pairs=[(x, x * x + (x == 3)) for x in range(-5, 6)], rule=lambda x: x * x + (x == 3))
+    f.check_symmetry()
+    analysis = f.analyze_interval(-5, 5)
+
+    assert analysis.symmetry == 'even'
+    assert f.return_symmetry_type == 'neither'
+
+
 def test_interval_increase():
     increasing_pairs = [(1, 2), (2, 4), (3, 6), (4, 8)]
     f = Function(pairs=increasing_pairs)
@@ -176,3 +187,277 @@ def test_invalid_function_instantiation():
     # Not a function: duplicate x with different y
     with pytest.raises(ValueError):
         Function(pairs=[(1, 2), (1, 3)])
+
+
+def test_compose_joins_pairs():
+    f = Function(pairs=([(x, x**2)
+                 for x in range(-5, 6)]), rule=lambda x: x**2)
+    g = Function(pairs=([(x, x + 1)
+                 for x in range(-5, 6)]), rule=lambda x: x + 1)
+
+    h = f.compose(g)
+
+    # g(5) = 6 falls outside the domain of f, so 5 is dropped
+    assert h.pairs == {(x, (x + 1)**2) for x in range(-5, 5)}
+    assert h.is_function is True
+
+
+def test_transforms_share_pairs():
+    f = Function(pairs=[(x, x**2) for x in range(-5, 6)], rule=lambda x: x**2)
+    g = f.vertical_shift(3)
+
+    assert g.pairs is f.pairs
+    assert g(2) == 7
+
+
+def test_transforms_skip_revalidation(monkeypatch):
+    f = Function(pairs=[(x, x**2) for x in range(-5, 6)], rule=lambda x: x**2)
+    monkeypatch.setattr(Function, 'is_function', property(lambda self: pytest.fail("revalidated")))
+
+    assert f.vertical_shift(1).reflect_over_y_axis().horizontal_stretch(2).pairs is f.pairs
+
+
+def test_function_with_and_without_pair_keep_rule():
+    f = Function(pairs=[(x, x**2) for x in range(3)], rule=lambda x: x**2)
+    grown = f.with_pair((3, 9))
+    shrunk = grown.without_pair((0, 0))
+
+    assert isinstance(grown, Function) and grown.rule is f.rule
+    assert isinstance(shrunk, Function) and shrunk.rule is f.rule
+    assert grown(5) == 25 and grown.get_value_for(3) == 9
+    assert f.with_pair((2, 4)) is f
+    with pytest.raises(ValueError):
+        f.with_pair((2, 5))
+    with pytest.raises(ValueError):
+        f.with_pairs([(7, 1), (7, 2)])
+
+
+def test_without_pair_carries_index_forward(monkeypatch):
+    f = Function(pairs=[(x, x**2) for x in range(100)], rule=lambda x: x**2)
+    assert f.get_value_for(3) == 9
+    # rebuilding the x index would iterate every pair
+    monkeypatch.setattr(PersistentSet, '__iter__', lambda self: pytest.fail("iterated all pairs"))
+    g = f.without_pair((3, 9)).with_pair((3, 10))
+
+    assert g.get_value_for(3) == 10 and g.get_value_for(4) == 16
+    assert f.without_pair((3, 9)).get_value_for(3) is None
+    assert f.get_value_for(3) == 9
+    with pytest.raises(ValueError):
+        g.with_pair((3, 11))
+    assert {g: 'hit'}[g] == 'hit'
+
+
+def test_function_as_dict_key():
+    rule = lambda x: x**2
+    f = Function(pairs=[(x, x**2) for x in range(3)], rule=rule)
+    same = Function(pairs=[(x, x**2) for x in range(3)], rule=rule)
+
+    cache = {f: 'hit'}
+    assert cache[same] == 'hit'
+    assert f != Function(pairs=f.pairs, rule=lambda x: x**2)
+
+
+def test_analyze_interval_rule_only_cubic():
+    f = Function(rule=lambda x: x**3 - 3 * x)
+    analysis = f.analyze_interval(-3, 3, tol=1e-6)
+
+    (max_x, max_y, max_kind, max_err), (min_x, min_y, min_kind, min_err) = analysis.extrema
+    assert max_kind == 'maximum' and min_kind == 'minimum'
+    assert abs(max_x - (-1)) <= max_err + 1e-6 and abs(max_y - 2) < 1e-9
+    assert abs(min_x - 1) <= min_err + 1e-6 and abs(min_y + 2) < 1e-9
+    assert len(analysis.increasing) == 2 and len(analysis.decreasing) == 1
+    assert analysis.symmetry == 'odd'
+
+
+def test_analyze_interval_uses_few_evaluations():
+    calls = []
+
+    def rule(x):
+        calls.append(x)
+        return (x - 0.3)**2
+
+    analysis = Function(rule=rule).analyze_interval(-2, 2, tol=1e-8)
+
+    # dense sampling at this resolution would need ~4e8 evaluations
+    assert analysis.evaluations == len(calls) < 200
+    assert abs(analysis.extrema[0].x - 0.3) < 1e-7
+    assert analysis.decreasing[0][0] == -2 and analysis.increasing[-1][1] == 2
+
+
+def test_analyze_interval_symmetry_and_constant():
+    even = Function(rule=lambda x: max(0, abs(x) - 1))
+    analysis = even.analyze_interval(-3, 3)
+
+    assert analysis.symmetry == 'even'
+    # the flat bottom between the two slopes is one minimum spanning the plateau
+    (minimum,) = analysis.extrema
+    assert minimum.kind == 'minimum' and minimum.x == 0 and minimum.y == 0
+    (lo, hi), = analysis.constant
+    assert minimum.x_error == (hi - lo) / 2
+    assert abs(lo + 1) <= analysis.boundary_error
+    assert abs(hi - 1) <= analysis.boundary_error
+
+
+def test_analyze_interval_not_symmetric_about_zero():
+    analysis = Function(rule=lambda x: 2 * x + 1).analyze_interval(1, 4)
+
+    assert analysis.increasing == [(1, 4)]
+    assert analysis.symmetry is None
+
+
+def test_analyze_interval_invalid_bounds():
+    with pytest.raises(ValueError):
+        Function(rule=lambda x: x).analyze_interval(2, 1)
+
+
+def test_derivative_of_polynomial_rule():
+    f = Function(rule=lambda x: x**3 - 3 * x)
+    df = f.derivative()
+
+    assert df(2) == 9
+    assert df(1) == 0
+    assert df.derivative()(2) == 12
+
+
+def test_derivative_through_operators_and_transforms():
+    f = Function(rule=lambda x: x**2)
+    g = Function(rule=lambda x: 3 * x + 1)
+
+    assert (f + g).derivative()(2) == 7
+    assert (f - g).derivative()(2) == 1
+    assert (f * g).derivative()(2) == 2 * 2 * 7 + 4 * 3
+    assert (f / g).derivative()(1) == (2 * 4 - 1 * 3) / 16
+    assert f.compose(g).derivative()(1) == 2 * 4 * 3
+    assert f.vertical_shift(5).derivative()(3) == 6
+    assert f.horizontal_shift(1).derivative()(3) == 4
+    assert f.vertical_stretch(2).derivative()(3) == 12
+    assert f.horizontal_stretch(2).derivative()(3) == 24
+    assert f.reflect_over_x_axis().derivative()(3) == -6
+    assert g.reflect_over_y_axis().derivative()(3) == -3
+
+
+def test_derivative_requires_rule():
+    f = Function(pairs=[(1, 1), (2, 4)])
+
+    with pytest.raises(ValueError):
+        f.derivative()
+    with pytest.raises(ValueError):
+        f.vertical_shift(1).derivative()(1)
+
+
+def test_analyze_interval_uses_derivative():
+    calls = []
+
+    def rule(x):
+        calls.append(x)
+        return x**3
+
+    analysis = Function(rule=rule).analyze_interval(-2, 2)
+
+    # f'(0) = 0 is an inflection point, not a turning point
+    assert analysis.increasing == [(-2, 2)]
+    assert analysis.extrema == []
+    assert len(calls) == 65
+
+
+def test_analyze_interval_falls_back_when_rule_drops_dual():
+    squares = Function([(x, x * x) for x in range(-5, 6)])
+    table = {x: x * x for x in range(-5, 6)}
+
+    for f in (squares.interpolate('nearest'), Function(rule=lambda x: table[round(x)])):
+        analysis = f.analyze_interval(-5, 5)
+        (minimum,) = analysis.extrema
+        assert minimum.kind == 'minimum' and abs(minimum.x) <= minimum.x_error and minimum.y == 0
+        assert all(hi <= 0 for _, hi in analysis.decreasing) and all(lo >= 0 for lo, _ in analysis.increasing)
+        assert analysis.decreasing and analysis.increasing
+
+
+def test_monotonicity_methods_use_rule():
+    parabola = Function([(x, x * x) for x in range(-5, 6)], rule=lambda x: x * x)
+    cubic = Function([(x, x**3) for x in range(-3, 4)], rule=lambda x: x**3)
+
+    assert parabola.intervals_of_decrease() == [(-5, 0)]
+    assert parabola.intervals_of_increase() == [(0, 5)]
+    assert not parabola.is_increasing() and not parabola.is_decreasing()
+    assert cubic.is_increasing() and not cubic.is_constant()
+    assert Function.constant(3, 0, 5).is_constant()
+
+
+def test_monotonicity_methods_fall_back_when_rule_is_undefined_between_samples():
+    table = {x: x * x for x in range(5)}
+    lookup = Function(pairs=table.items(), rule=lambda x: table[x])
+    reciprocal = Function(pairs=[(x, 1 / x) for x in (-2, -1, 1, 2)], rule=lambda x: 1 / x)
+
+    assert lookup.intervals_of_increase() == [(0, 1), (1, 2), (2, 3), (3, 4)]
+    assert lookup.is_increasing()
+    assert reciprocal.intervals_of_decrease() == [(-2, -1), (1, 2)]
+    assert not reciprocal.is_decreasing() and not reciprocal.is_constant()
+
+
+def test_analyze_interval_where_derivative_is_undefined():
+    for rule in (lambda x: x**0.5, dual.sqrt):
+        analysis = Function(rule=rule).analyze_interval(0, 4)
+        assert analysis.increasing == [(0, 4)] and analysis.extrema == []
+
+
+def test_derivative_rejects_rule_that_drops_dual():
+    table = {x: x * x for x in range(5)}
+
+    with pytest.raises(TypeError):
+        Function(rule=lambda x: table[x]).derivative()(2)
+    assert Function.constant(3).derivative()(2) == 0
+
+
+def test_monotonicity_methods_without_rule():
+    assert Function([(1, 2), (2, 4), (3, 6)]).is_increasing()
+    assert Function([(1, 6), (2, 4), (3, 2)]).is_decreasing()
+    assert not Function([(0, 0), (1, 1), (2, 0)]).is_increasing()
+    assert not Function([(1, 1)]).is_constant()
+
+
+def test_compile_matches_interpreted_evaluation():
+    f = Function(rule=lambda x: x**2)
+    g = Function(rule=lambda x: 3 * x + 1)
+    pipeline = (f.compose(g) - f).horizontal_shift(2).vertical_stretch(
+        0.5).reflect_over_x_axis().reflect_over_y_axis() * g.horizontal_stretch(2)
+    compiled = pipeline.compile()
+    xs = [x / 4 for x in range(-20, 21)]
+
+    assert compiled.evaluate_many(xs) == pipeline.evaluate_many(xs)
+    assert compiled(1.5) == pipeline(1.5)
+    assert pipeline.compile() is compiled
+
+
+def test_compile_keeps_pairs_and_derivative():
+    f = Function(pairs=[(x, x**2) for x in range(-3, 4)], rule=lambda x: x**2)
+    compiled = f.vertical_shift(1).compile()
+
+    assert compiled.pairs == f.pairs
+    assert compiled.derivative()(3) == 6
+
+
+def test_compile_pair_only_leaf():
+    table = Function(pairs=[(0, 10), (1, 20)])
+    compiled = table.vertical_shift(1).compile()
+
+    assert compiled(1) == 21
+    assert compiled.evaluate_many([0, 1]) == [11, 21]
+
+
+def test_get_value_for_missing_input():
+    f = Function(pairs=[(1, 2), (3, 4)])
+
+    assert f(3) == 4
+    assert f(2) is None
+
+
+def test_interpolate_pair_backed_function():
+    f = Function(pairs=[(0, 0.0), (1, 10.0), (2, 40.0)])
+    linear = f.interpolate()
+
+    assert linear(0.5) == 5.0
+    assert linear(1 + 1e-12) == 10.0
+    assert linear.evaluate_many([0.25, 1.5]) == [2.5, 25.0]
+    assert linear.pairs is f.pairs
+    assert f.interpolate('spline').fingerprint != linear.fingerprint
+    assert Function(pairs=[(0, 0.0), (1, 99.0)]).interpolate().fingerprint != linear.fingerprint
@@ -0,0 +1,71 @@
+import math
+import pytest
+from Math.core.functions import Function
+from Math.core.interpolation import Interpolator
+
+samples = [(x / 2, math.sin(x / 2)) for x in range(0, 13)]
+
+
+def test_interpolator_hits_samples_exactly():
+    for mode in ('nearest', 'linear', 'monotone', 'spline'):
+        interpolator = Interpolator(samples, mode)
+        assert all(interpolator(x) == y for x, y in samples)
+
+
+def test_interpolator_snaps_approximate_keys():
+    interpolator = Interpolator(samples, 'spline', tol=1e-6)
+
+    assert interpolator(0.5 + 1e-8) == math.sin(0.5)
+    assert interpolator(6.0 + 1e-8) == math.sin(6.0)
+
+
+def test_nearest_and_linear():
+    points = [(0, 0.0), (1, 10.0), (3, 30.0)]
+
+    assert Interpolator(points, 'nearest')(0.4) == 0.0
+    assert Interpolator(points, 'nearest')(2.2) == 30.0
+    assert Interpolator(points, 'linear')(0.25) == 2.5
+    assert Interpolator(points, 'linear')(2) == 20.0
+
+
+def test_nearest_allows_non_numeric_values():
+    labels = Function(pairs=[(0, 'low'), (1, 'mid'), (2, 'high')]).interpolate('nearest')
+
+    assert labels(0.4) == 'low' and labels(1.2) == 'mid' and labels(1.9) == 'high'
+    assert Interpolator([(0, 'a'), (1, 'b')], 'nearest').many([0.2, 0.8]) == ['a', 'b']
+    with pytest.raises(TypeError):
+        Interpolator([(0, 'a'), (1, 'b')], 'linear')
+
+
+def test_spline_is_accurate_and_natural():
+    spline = Interpolator(samples, 'spline')
+
+    assert abs(spline(1.75) - math.sin(1.75)) < 1e-3
+    step = 1e-3
+    second_derivative = (spline(0) - 2 * spline(step) + spline(2 * step)) / step**2
+    assert abs(second_derivative) < 1e-2
+
+
+def test_spline_reproduces_straight_line():
+    line = Interpolator([(x, 2 * x + 1) for x in (0, 1, 2.5, 4)], 'spline')
+
+    assert math.isclose(line(3.3), 7.6)
+
+
+def test_monotone_cubic_does_not_overshoot():
+    steps = [(0, 0.0), (1, 1.0), (2, 1.0), (3, 5.0), (4, 5.1)]
+    monotone = Interpolator(steps, 'monotone')
+    values = monotone.many([x / 100 for x in range(401)])
+
+    assert all(b >= a for a, b in zip(values, values[1:]))
+    assert max(values) == 5.1
+    assert all(v == 1.0 for v in monotone.many([1.2, 1.5, 1.8]))
+
+
+def test_interpolator_rejects_bad_input():
+    with pytest.raises(ValueError):
+        Interpolator(samples, 'quadratic')
+    with pytest.raises(ValueError):
+        Interpolator([(0, 1)], 'linear')
+    with pytest.raises(ValueError):
+        Interpolator(samples, 'linear')(7)
@@ -0,0 +1,121 @@
+import random
+from Math.core.persistent import PersistentIndex, PersistentSet
+
+
+class CollidingKey:
+    """Key with a deliberately weak hash to force full-hash collisions."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return self.value % 3
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and other.value == self.value
+
+
+def test_persistent_set_matches_builtin_set():
+    """Test that a random mix of adds and discards tracks a builtin set."""
+    rng = random.Random(3)
+    reference = set(range(0, 40, 3))
+    pset = PersistentSet(reference)
+    for _ in range(500):
+        key = rng.randrange(80)
+        if rng.random() < 0.6:
+            reference.add(key)
+            pset = pset.with_(key)
+        else:
+            reference.discard(key)
+            pset = pset.without(key)
+        assert len(pset) == len(reference)
+    assert pset == reference
+    assert set(pset) == reference
+
+
+def test_persistent_set_updates_leave_original_untouched():
+    original = PersistentSet(range(100))
+    added = original.with_(100)
+    removed = added.without(5)
+
+    assert 100 not in original and len(original) == 100
+    assert 100 in added and 5 in added
+    assert 5 not in removed and len(removed) == 100
+    assert original.without(1000) is original
+    assert original.with_(5) is original
+
+
+def test_persistent_set_has_no_mutators():
+    pset = PersistentSet([1, 2])
+
+    for name in ('add', 'discard', 'update', 'remove', 'clear'):
+        assert not hasattr(pset, name)
+    assert pset.union_all([2, 3, 4]) == {1, 2, 3, 4} and pset == {1, 2}
+
+
+def test_persistent_set_hash_collisions():
+    keys = [CollidingKey(v) for v in range(20)]
+    pset = PersistentSet()
+    for key in keys:
+        pset = pset.with_(key)
+    for key in keys[::2]:
+        pset = pset.without(key)
+
+    assert len(pset) == 10
+    assert all(key in pset for key in keys[1::2])
+    assert not any(key in pset for key in keys[::2])
+
+
+def test_persistent_set_hash_is_order_independent():
+    built = PersistentSet([(1, 2), (3, 4), (5, 6)])
+    grown = PersistentSet().with_((5, 6)).with_((3, 4)).with_((1, 2))
+
+    assert built == grown
+    assert hash(built) == hash(grown)
+    assert {built: 'cached'}[grown] == 'cached'
+
+
+def test_persistent_set_operators():
+    pset = PersistentSet([1, 2, 3])
+
+    assert pset | {4} == {1, 2, 3, 4}
+    assert pset & {2, 3, 9} == {2, 3}
+    assert pset - {1} == {2, 3}
+    assert isinstance(pset | {4}, PersistentSet)
+
+
+def test_persistent_index_matches_dict_of_sets():
+    """Test that random extends and retracts track a dict of sets, and old versions are untouched."""
+    rng = random.Random(5)
+    reference = {x: {x} for x in range(50)}
+    index = PersistentIndex({x: set(ys) for x, ys in reference.items()})
+    versions = [(index, {x: set(ys) for x, ys in reference.items()})]
+    for _ in range(300):
+        entries = [(rng.randrange(120), rng.randrange(3)) for _ in range(rng.randrange(1, 4))]
+        if rng.random() < 0.4:
+            for x, y in entries:
+                reference.get(x, set()).discard(y)
+                if not reference.get(x, True):
+                    del reference[x]
+            index = index.retract(entries)
+        else:
+            for x, y in entries:
+                reference.setdefault(x, set()).add(y)
+            index = index.extend(entries)
+        versions.append((index, {x: set(ys) for x, ys in reference.items()}))
+
+    for version, expected in versions:
+        assert len(version) == len(expected)
+        assert {x: set(version[x]) for x in version} == expected
+        assert version.get(1000) is None
+    assert len(index._layers) <= 10
+
+
+def test_persistent_set_derived_hash_is_incremental():
+    base = PersistentSet(range(10_000))
+    hash(base.with_(-1))
+    grown = base.with_(-1).with_(-2).without(5)
+
+    assert grown._hash_sum is not None
+    assert hash(grown) == hash(PersistentSet(set(range(10_000)) - {5} | {-1, -2}))
+    assert hash(grown.without(-2).with_(5).without(-1)) == hash(base)
@@ -1,4 +1,5 @@
 import random
+import pytest
 from Math.core.relation import Relation
 
 
@@ -241,3 +242,148 @@ def test_relation_get_value_for_is_found():
 
     assert rel.get_value_for(2) == 4
     assert rel.get_value_for(3) == 5
+
+
+def test_relation_compose_hash_join():
+    """Test that composition joins pairs on the shared middle element."""
+    r = Relation([(1, 'a'), (2, 'b'), (3, 'c')])
+    s = Relation([(10, 1), (20, 2), (20, 3), (30, 4)])
+
+    composed = r.compose(s)
+
+    assert composed.pairs == {(10, 'a'), (20, 'b'), (20, 'c')}
+
+
+def test_relation_compose_no_shared_elements():
+    r = Relation([(1, 2)])
+    s = Relation([(5, 6)])
+
+    assert r.compose(s).pairs == set()
+
+
+def test_relation_set_operations():
+    r = Relation([(1, 2), (2, 3), (3, 4)])
+    s = Relation([(2, 3), (3, 4), (4, 5)])
+
+    assert r.union(s).pairs == {(1, 2), (2, 3), (3, 4), (4, 5)}
+    assert r.intersection(s).pairs == {(2, 3), (3, 4)}
+    assert r.difference(s).pairs == {(1, 2)}
+
+
+def test_relation_restrict_image_preimage():
+    rel = Relation([(1, 'a'), (1, 'b'), (2, 'b'), (3, 'c')])
+
+    assert rel.restrict({1, 4}).pairs == {(1, 'a'), (1, 'b')}
+    assert rel.image({1, 2}) == {'a', 'b'}
+    assert rel.image({99}) == set()
+    assert rel.preimage({'b'}) == {1, 2}
+    assert rel.preimage({'c', 'z'}) == {3}
+
+
+def test_relation_property_checks():
+    """Test reflexive, symmetric, antisymmetric and transitive checks."""
+    equality = Relation([(x, x) for x in range(5)])
+    assert equality.is_reflexive() is True
+    assert equality.is_reflexive(universe=range(6)) is False
+    assert equality.is_symmetric is True
+    assert equality.is_antisymmetric is True
+    assert equality.is_transitive is True
+
+    less_than = Relation([(x, y) for x in range(5) for y in range(5) if x < y])
+    assert less_than.is_reflexive() is False
+    assert less_than.is_symmetric is False
+    assert less_than.is_antisymmetric is True
+    assert less_than.is_transitive is True
+
+    chain = Relation([(1, 2), (2, 3), (3, 2)])
+    assert chain.is_antisymmetric is False
+    assert chain.is_transitive is False
+
+
+def test_relation_is_equivalence():
+    same_parity = Relation([(x, y) for x in range(6)
+                           for y in range(6) if x % 2 == y % 2])
+
+    assert same_parity.is_equivalence() is True
+    assert Relation([(1, 2), (2, 1)]).is_equivalence() is False
+
+
+def test_relation_equivalence_classes():
+    same_parity = Relation([(x, y) for x in range(6)
+                           for y in range(6) if x % 2 == y % 2])
+    classes = same_parity.equivalence_classes()
+
+    assert sorted(map(sorted, classes)) == [[0, 2, 4], [1, 3, 5]]
+
+
+def test_relation_equivalence_classes_requires_equivalence():
+    with pytest.raises(ValueError):
+        Relation([(1, 2)]).equivalence_classes()
+
+
+def test_transitive_closure_of_chain():
+    chain = Relation([(1, 2), (2, 3), (3, 4)])
+
+    assert chain.transitive_closure().pairs == {
+        (1, 2), (1, 3), (1, 4), (2, 3), (2, 4), (3, 4)}
+
+
+def test_transitive_closure_with_cycle():
+    cycle = Relation([(1, 2), (2, 1), (2, 3)])
+    closure = cycle.transitive_closure()
+
+    assert closure.pairs == {(1, 1), (1, 2), (1, 3),
+                             (2, 1), (2, 2), (2, 3)}
+    assert closure.is_transitive is True
+
+
+def test_transitive_closure_random_matches_naive():
+    """Test the closure against repeated self-composition on random relations."""
+    rng = random.Random(7)
+    for _ in range(50):
+        rel = Relation([(rng.randrange(8), rng.randrange(8))
+                       for _ in range(rng.randrange(20))])
+        naive = rel
+        while True:
+            grown = naive.union(naive.compose(naive))
+            if grown.pairs == naive.pairs:
+                break
+            naive = grown
+        assert rel.transitive_closure().pairs == naive.pairs
+
+
+def test_transitive_closure_large_chain():
+    chain = Relation([(x, x + 1) for x in range(1000)])
+
+    assert len(chain.transitive_closure().pairs) == 1000 * 1001 // 2
+
+
+def test_relation_pairs_are_immutable():
+    rel = Relation([(1, 2)])
+
+    with pytest.raises(AttributeError):
+        rel.pairs.add((3, 4))
+    with pytest.raises(AttributeError):
+        rel.pairs = set()
+    assert rel.pairs == {(1, 2)}
+
+
+def test_relation_with_and_without_pair():
+    rel = Relation([(x, x + 1) for x in range(100)])
+    grown = rel.with_pair((100, 101))
+    shrunk = grown.without_pair((0, 1))
+
+    assert len(rel.pairs) == 100
+    assert (100, 101) in grown.pairs and len(grown.pairs) == 101
+    assert (0, 1) not in shrunk.pairs and (0, 1) in grown.pairs
+    assert rel.with_pairs([(0, 1), (1, 2)]) is rel
+
+
+def test_relation_hashable_and_equal_by_pairs():
+    first = Relation([(1, 2), (3, 4)])
+    second = Relation([(3, 4), (1, 2)])
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first != Relation([(1, 2)])
+    assert len({first, second}) == 1
@@ -0,0 +1,78 @@
+import multiprocessing
+import random
+import pytest
+from Math.core.relation import Relation
+from Math.core.sharding import validate_sharded, sketch_pairs
+from Math.core.sketch import HyperLogLog
+
+
+def test_validate_sharded_matches_relation():
+    rng = random.Random(11)
+    for size in (0, 50, 2000):
+        pairs = [(rng.randrange(400), rng.randrange(400)) for _ in range(size)]
+        rel = Relation(pairs)
+        result = validate_sharded(pairs, shards=3, chunk_size=64)
+
+        assert result.is_function == rel.is_function
+        assert result.is_one_to_one == rel.is_one_to_one
+        assert result.pair_count == len(rel.pairs)
+        assert result.domain_size == len(rel.domain)
+        assert result.range_size == len(rel.range)
+
+
+def test_validate_sharded_streams_generators():
+    result = validate_sharded(((x, 2 * x) for x in range(100_000)), shards=2)
+
+    assert result.is_function and result.is_one_to_one
+    assert result.pair_count == 100_000
+
+
+def test_validate_sharded_detects_failures():
+    result = validate_sharded([(1, 'a'), (2, 'a'), (1, 'a'), (3, 'b'), (3, 'c')], shards=2)
+
+    assert result.is_function is False
+    assert result.is_one_to_one is False
+    assert result.pair_count == 4
+    assert (result.domain_size, result.range_size) == (3, 3)
+
+
+def test_validate_sharded_raises_when_worker_dies_mid_stream():
+    def stream():
+        yield from ((x, x) for x in range(100))
+        for child in multiprocessing.active_children():
+            child.kill()
+        yield from ((x, x) for x in range(100, 100_000))
+
+    with pytest.raises(RuntimeError):
+        validate_sharded(stream(), shards=2, chunk_size=10, timeout=0.2)
+
+
+def test_validate_sharded_rejects_zero_shards():
+    with pytest.raises(ValueError):
+        validate_sharded([], shards=0)
+
+
+def test_hyperloglog_estimate_is_close():
+    sketch = HyperLogLog().update(range(100_000))
+
+    assert abs(sketch.estimate() - 100_000) / 100_000 < 0.03
+    assert len(HyperLogLog().update([1, 1, 1, 2])) == 2
+    assert len(sketch.registers) == 1 << 14
+
+
+def test_hyperloglog_merge_estimates_union():
+    left = HyperLogLog(12).update(range(0, 60_000))
+    right = HyperLogLog(12).update(range(30_000, 90_000))
+    merged = left.merge(right)
+
+    assert abs(merged.estimate() - 90_000) / 90_000 < 0.05
+    assert (left | right).registers == merged.registers
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(10))
+
+
+def test_sketch_pairs_estimates_domain_and_range():
+    domain, range_ = sketch_pairs((x, x % 500) for x in range(50_000))
+
+    assert abs(domain.estimate() - 50_000) / 50_000 < 0.03
+    assert abs(range_.estimate() - 500) / 500 < 0.03
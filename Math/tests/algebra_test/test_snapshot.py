@@ -0,0 +1,116 @@
+import threading
+import pytest
+from Math.core.functions import Function
+from Math.core.persistent import PersistentSet
+from Math.core.relation import Relation
+from Math.core.snapshot import ConcurrentRelation
+
+
+def test_snapshots_are_isolated_from_later_writes():
+    store = ConcurrentRelation([(0, 0)])
+    before = store.snapshot
+    store.add((1, 1))
+
+    assert before.pairs == {(0, 0)}
+    assert store.snapshot.pairs == {(0, 0), (1, 1)}
+    assert store.version == 1
+
+
+def test_batched_publishing():
+    store = ConcurrentRelation(batch_size=3)
+    store.add((1, 1))
+    store.add((2, 2))
+
+    assert store.snapshot.pairs == set() and store.version == 0
+    store.add((3, 3))
+    assert len(store.snapshot.pairs) == 3 and store.version == 1
+    store.add((4, 4))
+    assert store.flush() == 2
+    assert store.flush() == 2
+    assert store.read() == (2, store.snapshot)
+
+
+def test_function_factory_rejects_bad_batch():
+    store = ConcurrentRelation([(1, 1)], factory=Function)
+
+    with pytest.raises(ValueError):
+        store.add((1, 2))
+    assert store.snapshot.pairs == {(1, 1)}
+    store.add((2, 4))
+    assert store.snapshot(2) == 4
+
+
+def test_rejected_pair_keeps_other_buffered_pairs():
+    store = ConcurrentRelation([(1, 1)], factory=Function, batch_size=3)
+    store.add((2, 4))
+
+    with pytest.raises(ValueError):
+        store.add_many([(3, 9), (2, 5)])
+    with pytest.raises(ValueError):
+        store.add((1, 2))
+    store.add((3, 9))
+    store.flush()
+    assert store.snapshot.pairs == {(1, 1), (2, 4), (3, 9)}
+
+
+def test_publishing_extends_index_without_revalidating(monkeypatch):
+    store = ConcurrentRelation([(x, x) for x in range(100)], factory=Function)
+    assert store.snapshot.get_value_for(5) == 5
+    # revalidating the whole function or rebuilding the x index would iterate every pair
+    monkeypatch.setattr(PersistentSet, '__iter__', lambda self: pytest.fail("iterated all pairs"))
+
+    for x in range(100, 200):
+        store.add((x, -x))
+        assert store.snapshot.get_value_for(x) == -x
+    assert store.snapshot.get_value_for(5) == 5 and store.version == 100
+
+
+def test_analysis_is_cached_per_version():
+    store = ConcurrentRelation([(1, 2)])
+    calls = []
+
+    def count_pairs(relation):
+        calls.append(relation)
+        return len(relation.pairs)
+
+    assert store.analysis('size', count_pairs) == 1
+    assert store.analysis('size', count_pairs) == 1
+    store.add((2, 1))
+    assert store.analysis('size', count_pairs) == 2
+    assert len(calls) == 2
+    assert store.analysis('symmetric', lambda r: r.is_symmetric) is True
+
+
+def test_concurrent_readers_and_writer():
+    store = ConcurrentRelation(factory=Function, batch_size=16)
+    errors = []
+    done = threading.Event()
+
+    def write():
+        for x in range(5000):
+            store.add((x, x * x))
+        store.flush()
+        done.set()
+
+    def read():
+        try:
+            while not done.is_set():
+                version, snapshot = store.read()
+                domain = snapshot.domain
+                assert len(domain) == len(snapshot.pairs)
+                for x in domain:
+                    assert snapshot.get_value_for(x) == x * x
+                assert store.version >= version
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    threads.append(threading.Thread(target=write))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(store.snapshot.pairs) == 5000
+    assert isinstance(store.snapshot, Relation)